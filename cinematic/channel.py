@@ -0,0 +1,253 @@
+"""
+Bulk keyframe import/export of section channels as NumPy arrays
+
+Float and double channels (e.g. the 9 channels of a 3D transform section)
+are exported to arrays of times, values and tangents, and arrays are written
+back with optional vectorized key reduction so dense mocap/camera curves
+only send the keys that matter through the engine API.
+
+Times are integer ticks of the sequence tick resolution by default, so keys
+between display frames (e.g. 120 Hz mocap in a 30 fps sequence) round trip
+without collapsing onto the same frame.
+"""
+
+import numpy as np
+
+import unreal
+
+
+CHANNEL_TYPES = (
+    unreal.MovieSceneScriptingFloatChannel,
+    unreal.MovieSceneScriptingDoubleChannel,
+)
+
+
+def get_channels(u_section):
+    """
+    Get float/double channels of a section
+
+    :param u_section: unreal.MovieSceneSection.
+    :return: {str: unreal.MovieSceneScriptingChannel}. channel by name
+    """
+    return {str(u_channel.channel_name): u_channel
+            for u_channel in u_section.get_all_channels()
+            if isinstance(u_channel, CHANNEL_TYPES)}
+
+
+def export_channel(
+        u_channel,
+        time_unit=unreal.SequenceTimeUnit.TICK_RESOLUTION
+):
+    """
+    Export the keys of a channel
+
+    :param u_channel: unreal.MovieSceneScriptingFloatChannel or
+                      unreal.MovieSceneScriptingDoubleChannel.
+    :param time_unit: unreal.SequenceTimeUnit. unit of the exported times,
+                      display rate times drop the sub-frame of the keys
+    :return: {str: numpy.ndarray}. 'times', 'values', 'arrive' and 'leave'
+             arrays of the same length
+    """
+    u_keys = u_channel.get_keys()
+    count = len(u_keys)
+
+    times = np.empty(count, dtype=np.int64)
+    values = np.empty(count, dtype=np.float64)
+    arrive = np.empty(count, dtype=np.float64)
+    leave = np.empty(count, dtype=np.float64)
+    for i, u_key in enumerate(u_keys):
+        times[i] = u_key.get_time(time_unit=time_unit).frame_number.value
+        values[i] = u_key.get_value()
+        arrive[i] = u_key.get_arrive_tangent()
+        leave[i] = u_key.get_leave_tangent()
+
+    return {'times': times, 'values': values, 'arrive': arrive, 'leave': leave}
+
+
+def export_channels(
+        u_section,
+        time_unit=unreal.SequenceTimeUnit.TICK_RESOLUTION
+):
+    """
+    Export all float/double channels of a section
+
+    :param u_section: unreal.MovieSceneSection.
+    :param time_unit: unreal.SequenceTimeUnit. unit of the exported times
+    :return: {str: {str: numpy.ndarray}}. exported arrays by channel name
+    """
+    return {name: export_channel(u_channel, time_unit)
+            for name, u_channel in get_channels(u_section).items()}
+
+
+def _line_deviation(times, values, first, last):
+    """
+    Absolute deviation of the keys between first and last from the line
+    joining them
+    """
+    t = times[first + 1:last]
+    span = times[last] - times[first]
+    weight = (t - times[first]) / span if span else np.zeros_like(t)
+    expected = values[first] + (values[last] - values[first]) * weight
+    return np.abs(values[first + 1:last] - expected)
+
+
+def max_deviation(times, values, keep):
+    """
+    Largest deviation of the original keys from the polyline of the kept
+    keys
+
+    :param times: numpy.ndarray. sorted key times
+    :param values: numpy.ndarray. key values
+    :param keep: numpy.ndarray. sorted indices of the kept keys
+    :return: float.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    deviation = 0.0
+    for first, last in zip(keep[:-1], keep[1:]):
+        if last - first > 1:
+            deviation = max(deviation, float(
+                _line_deviation(times, values, first, last).max()))
+    return deviation
+
+
+def reduce_keys(times, values, tolerance):
+    """
+    Ramer-Douglas-Peucker reduction: a segment keeps splitting at its
+    farthest key until every original key lies within tolerance of the
+    line between the kept keys around it, so `max_deviation` of the
+    result never exceeds tolerance. The error is measured against linear
+    interpolation, see `import_channel`.
+
+    :param times: numpy.ndarray. sorted key times
+    :param values: numpy.ndarray. key values
+    :param tolerance: float. maximum absolute value deviation
+    :return: numpy.ndarray. indices of the keys to keep
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    count = len(times)
+    if count <= 2:
+        return np.arange(count)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        deviation = _line_deviation(times, values, first, last)
+        farthest = int(np.argmax(deviation))
+        if deviation[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return np.flatnonzero(keep)
+
+
+def import_channel(
+        u_channel,
+        times,
+        values,
+        arrive=None,
+        leave=None,
+        tolerance=None,
+        clear=True,
+        time_unit=unreal.SequenceTimeUnit.TICK_RESOLUTION
+):
+    """
+    Write arrays of keys to a channel
+
+    :param u_channel: unreal.MovieSceneScriptingFloatChannel or
+                      unreal.MovieSceneScriptingDoubleChannel.
+    :param times: numpy.ndarray. integer key times
+    :param values: numpy.ndarray. key values
+    :param arrive: numpy.ndarray. (Optional) arrive tangents, keys use auto
+                   tangents if not given, or linear interpolation when
+                   reduced so the curve matches the validated polyline
+    :param leave: numpy.ndarray. (Optional) leave tangents
+    :param tolerance: float. (Optional) key reduction tolerance, no
+                      reduction if not given
+    :param clear: bool. whether to remove the existing keys first
+    :param time_unit: unreal.SequenceTimeUnit. unit of the given times
+    :return: int. number of keys written
+    """
+    times = np.asarray(times, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    if times.shape != values.shape:
+        raise ValueError('Times and values have to be of the same length')
+
+    order = np.argsort(times, kind='stable')
+    if tolerance is not None:
+        order = order[reduce_keys(times[order], values[order], tolerance)]
+
+    if clear:
+        for u_key in u_channel.get_keys():
+            u_channel.remove_key(u_key)
+
+    user_tangents = arrive is not None and leave is not None
+    if user_tangents:
+        arrive = np.asarray(arrive, dtype=np.float64)[order]
+        leave = np.asarray(leave, dtype=np.float64)[order]
+
+    # auto tangents would overshoot between the sparse reduced keys
+    interpolation = unreal.MovieSceneKeyInterpolation.AUTO
+    if tolerance is not None and not user_tangents:
+        interpolation = unreal.MovieSceneKeyInterpolation.LINEAR
+
+    for i, (time, value) in enumerate(
+            zip(times[order].tolist(), values[order].tolist())):
+        u_key = u_channel.add_key(
+            unreal.FrameNumber(time),
+            value,
+            time_unit=time_unit,
+            interpolation=interpolation
+        )
+        if user_tangents:
+            u_key.set_tangent_mode(unreal.RichCurveTangentMode.RCTM_USER)
+            u_key.set_arrive_tangent(float(arrive[i]))
+            u_key.set_leave_tangent(float(leave[i]))
+
+    return len(order)
+
+
+def import_channels(
+        u_section,
+        arrays,
+        tolerance=None,
+        clear=True,
+        time_unit=unreal.SequenceTimeUnit.TICK_RESOLUTION
+):
+    """
+    Write exported arrays back to the channels of a section
+
+    :param u_section: unreal.MovieSceneSection.
+    :param arrays: {str: {str: numpy.ndarray}}. arrays by channel name, as
+                   returned by `export_channels`
+    :param tolerance: float. (Optional) key reduction tolerance
+    :param clear: bool. whether to remove the existing keys first
+    :param time_unit: unreal.SequenceTimeUnit. unit of the given times
+    :return: {str: int}. number of keys written per channel
+    """
+    u_channels = get_channels(u_section)
+    missing = set(arrays) - set(u_channels)
+    if missing:
+        raise ValueError('Unknown channels {}'.format(sorted(missing)))
+
+    return {
+        name: import_channel(
+            u_channels[name],
+            data['times'],
+            data['values'],
+            data.get('arrive'),
+            data.get('leave'),
+            tolerance,
+            clear,
+            time_unit
+        )
+        for name, data in arrays.items()
+    }
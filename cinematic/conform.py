@@ -0,0 +1,273 @@
+"""
+Declarative level sequence description
+
+Read an existing level sequence into plain records, diff it against a target
+description (e.g. built from an EDL) and apply only the edits needed, so a
+re-conform costs proportional to what changed instead of rebuilding all
+tracks.
+
+Frame ranges follow the engine convention: start inclusive, end exclusive.
+"""
+
+from collections import Counter, namedtuple
+
+import unreal
+
+from . import section, sequence, track
+
+
+Shot = namedtuple('Shot', 'sub_seq start end')
+SubSequence = namedtuple('SubSequence', 'sub_seq start end')
+CameraCut = namedtuple('CameraCut', 'binding start end')
+SkmAnim = namedtuple('SkmAnim', 'binding anim start end')
+
+Edit = namedtuple('Edit', 'action old new')
+
+ADD = 'add'
+REMOVE = 'remove'
+UPDATE = 'update'
+
+# identity of each record kind, records sharing a key are paired by
+# ordinal of start frame and updated in place
+KEYS = {
+    Shot: lambda record: record.sub_seq,
+    SubSequence: lambda record: record.sub_seq,
+    CameraCut: lambda record: record.start,
+    SkmAnim: lambda record: (record.binding, record.anim),
+}
+
+
+class SequenceDescription(object):
+
+    def __init__(self, shots=(), sub_sequences=(), camera_cuts=(), anims=()):
+        """
+        :param shots: [Shot]. sections of the cinematic shot track
+        :param sub_sequences: [SubSequence]. sections of the subsequence track
+        :param camera_cuts: [CameraCut]. sections of the camera cut track,
+                            binding being the camera binding display name
+        :param anims: [SkmAnim]. skeletal animation sections, binding being
+                      the skeletal actor binding display name
+        """
+        self.shots = list(shots)
+        self.sub_sequences = list(sub_sequences)
+        self.camera_cuts = list(camera_cuts)
+        self.anims = list(anims)
+
+    @property
+    def records(self):
+        return self.shots + self.sub_sequences + self.camera_cuts + self.anims
+
+
+def _get_range(u_section):
+    return u_section.get_start_frame(), u_section.get_end_frame()
+
+
+def _get_path(u_asset):
+    return u_asset.get_path_name() if u_asset else None
+
+
+def collect_sections(u_seq):
+    """
+    Read every supported section of a level u_seq
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :return: [(record, unreal.MovieSceneSection)]. record of each section,
+             a sub sequence used by many shots gives many records
+    """
+    sections = list()
+    u_bindings = u_seq.get_bindings()
+    guid_names = {str(u_binding.get_id()): u_binding.get_display_name()
+                  for u_binding in u_bindings}
+
+    for u_track in u_seq.get_master_tracks():
+        for u_section in track.get_sections(u_track):
+            if isinstance(u_track, unreal.MovieSceneCinematicShotTrack):
+                record = Shot(_get_path(section.get_sub_seq(u_section)),
+                              *_get_range(u_section))
+            elif isinstance(u_track, unreal.MovieSceneSubTrack):
+                record = SubSequence(_get_path(section.get_sub_seq(u_section)),
+                                     *_get_range(u_section))
+            elif isinstance(u_track, unreal.MovieSceneCameraCutTrack):
+                guid = u_section.get_camera_binding_id().get_editor_property(
+                    'guid')
+                record = CameraCut(guid_names.get(str(guid)),
+                                   *_get_range(u_section))
+            else:
+                continue
+            sections.append((record, u_section))
+
+    for u_binding in u_bindings:
+        u_tracks = u_binding.find_tracks_by_type(
+            unreal.MovieSceneSkeletalAnimationTrack)
+        for u_track in u_tracks:
+            for u_section in track.get_sections(u_track):
+                u_anim = u_section.get_editor_property('params').animation
+                record = SkmAnim(u_binding.get_display_name(),
+                                 _get_path(u_anim),
+                                 *_get_range(u_section))
+                sections.append((record, u_section))
+
+    return sections
+
+
+def describe(records):
+    """
+    :param records: [record]. any of Shot, SubSequence, CameraCut, SkmAnim
+    :return: SequenceDescription.
+    """
+    description = SequenceDescription()
+    groups = {
+        Shot: description.shots,
+        SubSequence: description.sub_sequences,
+        CameraCut: description.camera_cuts,
+        SkmAnim: description.anims,
+    }
+    for record in records:
+        groups[type(record)].append(record)
+    return description
+
+
+def read(u_seq):
+    """
+    Describe an existing level u_seq
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :return: SequenceDescription.
+    """
+    return describe(record for record, _ in collect_sections(u_seq))
+
+
+def _group(records):
+    groups = dict()
+    for record in records:
+        key = (type(record), KEYS[type(record)](record))
+        groups.setdefault(key, list()).append(record)
+    return groups
+
+
+def diff(current, target):
+    """
+    Compute the minimal edits turning a description into another
+
+    Records sharing a key (e.g. shots of the same sub sequence) are first
+    matched when identical, the remaining ones are paired in start frame
+    order, extra records are added or removed
+
+    :param current: SequenceDescription. description of the existing u_seq
+    :param target: SequenceDescription. desired description
+    :return: [Edit]. removals first, then updates and additions
+    """
+    current_groups = _group(current.records)
+    target_groups = _group(target.records)
+
+    removes = list()
+    updates = list()
+    adds = list()
+    for key in list(current_groups) + [
+            k for k in target_groups if k not in current_groups]:
+        olds = Counter(current_groups.get(key, ()))
+        news = Counter(target_groups.get(key, ()))
+        unchanged = olds & news
+        olds = sorted((olds - unchanged).elements(),
+                      key=lambda r: (r.start, r.end))
+        news = sorted((news - unchanged).elements(),
+                      key=lambda r: (r.start, r.end))
+
+        for old, new in zip(olds, news):
+            updates.append(Edit(UPDATE, old, new))
+        for old in olds[len(news):]:
+            removes.append(Edit(REMOVE, old, None))
+        for new in news[len(olds):]:
+            adds.append(Edit(ADD, None, new))
+
+    return removes + updates + adds
+
+
+def _get_track(u_seq, typ):
+    # exact type, shot tracks are also subsequence tracks
+    for u_track in u_seq.get_master_tracks():
+        if type(u_track) is typ:
+            return u_track
+    return sequence.add_track(u_seq, typ)
+
+
+def _get_anim_track(u_binding):
+    u_tracks = u_binding.find_tracks_by_type(
+        unreal.MovieSceneSkeletalAnimationTrack)
+    if u_tracks:
+        return u_tracks[0]
+    return u_binding.add_track(unreal.MovieSceneSkeletalAnimationTrack)
+
+
+def _set_record(u_section, record, u_bindings):
+    if isinstance(record, (Shot, SubSequence)):
+        section.set_sub_seq(u_section, unreal.load_asset(record.sub_seq))
+    elif isinstance(record, CameraCut):
+        section.bind_camera(u_section, u_bindings[record.binding])
+    elif isinstance(record, SkmAnim):
+        section.set_skm_anim(u_section, unreal.load_asset(record.anim))
+    section.set_range(u_section, record.start, record.end)
+
+
+def apply_edits(u_seq, edits, sections=None, save=True):
+    """
+    Apply edits to a level u_seq within a single batch edit
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :param edits: [Edit]. edits from `diff`
+    :param sections: [(record, unreal.MovieSceneSection)]. (Optional)
+                     result of `collect_sections`, read again if not given
+    :param save: bool. whether to save the u_seq asset afterwards
+    :return: {str: float}. batch edit timings
+    """
+    if sections is None:
+        sections = collect_sections(u_seq)
+    # identical records may be backed by many sections
+    record_sections = dict()
+    for record, u_section in sections:
+        record_sections.setdefault(record, list()).append(u_section)
+    u_bindings = {u_binding.get_display_name(): u_binding
+                  for u_binding in u_seq.get_bindings()}
+    track_types = {
+        Shot: unreal.MovieSceneCinematicShotTrack,
+        SubSequence: unreal.MovieSceneSubTrack,
+        CameraCut: unreal.MovieSceneCameraCutTrack,
+    }
+
+    with sequence.BatchEdit(u_seq, 'Conform Sequence', save) as batch:
+        for edit in edits:
+            if edit.action == REMOVE:
+                u_section = record_sections[edit.old].pop()
+                batch.run(track.remove_section,
+                          section.get_track(u_section), u_section)
+
+            elif edit.action == UPDATE:
+                u_section = record_sections[edit.old].pop()
+                batch.run(_set_record, u_section, edit.new, u_bindings)
+
+            else:
+                record = edit.new
+                if isinstance(record, SkmAnim):
+                    u_track = _get_anim_track(u_bindings[record.binding])
+                else:
+                    u_track = _get_track(u_seq, track_types[type(record)])
+                u_section = batch.add_section(u_track)
+                batch.run(_set_record, u_section, record, u_bindings)
+
+    return batch.timings
+
+
+def conform(u_seq, target, save=True):
+    """
+    Make a level u_seq match a description with the minimal set of edits
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :param target: SequenceDescription. desired description
+    :param save: bool. whether to save the u_seq asset afterwards
+    :return: [Edit]. edits applied
+    """
+    sections = collect_sections(u_seq)
+    edits = diff(describe(record for record, _ in sections), target)
+    if edits:
+        apply_edits(u_seq, edits, sections, save)
+    return edits
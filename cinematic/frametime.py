@@ -0,0 +1,217 @@
+"""
+Frame accurate time conversion
+
+Frame rates are kept as exact fractions (e.g. 24000/1001 for 23.976) so
+conversions between frames, seconds, ticks and timecode don't drift, and the
+rates of a level sequence can be cached for batches of reads.
+"""
+
+import math
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# sequence path: (display rate, tick resolution)
+RATE_CACHE = dict()
+
+
+def to_fraction(u_framerate):
+    """
+    :param u_framerate: unreal.FrameRate.
+    :return: fractions.Fraction. frames per second
+    """
+    return Fraction(u_framerate.numerator, u_framerate.denominator)
+
+
+def get_rates(u_seq, cached=True):
+    """
+    Get the display rate and tick resolution of a level u_seq
+
+    The cache is keyed by path and does not see rate changes or assets
+    recreated at the same path, only use it within a batch of reads and
+    call `clear_cache` afterwards
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :param cached: bool. whether to read through RATE_CACHE
+    :return: (fractions.Fraction, fractions.Fraction). frames and ticks per
+             second
+    """
+    if not cached:
+        return (to_fraction(u_seq.get_display_rate()),
+                to_fraction(u_seq.get_tick_resolution()))
+
+    key = u_seq.get_path_name()
+    if key not in RATE_CACHE:
+        RATE_CACHE[key] = (
+            to_fraction(u_seq.get_display_rate()),
+            to_fraction(u_seq.get_tick_resolution())
+        )
+    return RATE_CACHE[key]
+
+
+def get_rate(u_seq, cached=True):
+    """
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :param cached: bool. whether to read through RATE_CACHE
+    :return: fractions.Fraction. display frames per second
+    """
+    if not cached:
+        return to_fraction(u_seq.get_display_rate())
+    return get_rates(u_seq)[0]
+
+
+def clear_cache(u_seq=None):
+    """
+    Forget cached rates, e.g. after changing a sequence display rate
+
+    :param u_seq: unreal.MovieSceneSequence. (Optional) only forget this
+                  sequence
+    """
+    if u_seq:
+        RATE_CACHE.pop(u_seq.get_path_name(), None)
+    else:
+        RATE_CACHE.clear()
+
+
+def round_half_up(value):
+    """
+    :param value: fractions.Fraction.
+    :return: int. nearest integer, halves rounded up like the vectorized
+             conversions
+    """
+    return math.floor(value + Fraction(1, 2))
+
+
+def frame_to_seconds(frame, rate):
+    """
+    :param frame: int or fractions.Fraction. frame number
+    :param rate: fractions.Fraction. frames per second
+    :return: fractions.Fraction. exact seconds
+    """
+    return Fraction(frame) / rate
+
+
+def seconds_to_frame(seconds, rate):
+    """
+    :param seconds: float or fractions.Fraction.
+    :param rate: fractions.Fraction. frames per second
+    :return: int. nearest frame number
+    """
+    return round_half_up(Fraction(seconds) * rate)
+
+
+def frame_to_tick(frame, rate, tick_rate):
+    """
+    :param frame: int. frame number in display rate
+    :param rate: fractions.Fraction. display frames per second
+    :param tick_rate: fractions.Fraction. ticks per second
+    :return: int. nearest tick
+    """
+    return round_half_up(Fraction(frame) * tick_rate / rate)
+
+
+def tick_to_frame(tick, rate, tick_rate):
+    """
+    :param tick: int. tick number
+    :param rate: fractions.Fraction. display frames per second
+    :param tick_rate: fractions.Fraction. ticks per second
+    :return: fractions.Fraction. frame in display rate, may be a sub-frame
+    """
+    return Fraction(tick) * rate / tick_rate
+
+
+def is_drop_frame(rate):
+    """
+    :param rate: fractions.Fraction. frames per second
+    :return: bool. whether the rate uses drop frame timecode (29.97, 59.94)
+    """
+    return rate.denominator == 1001 and rate.numerator % 30000 == 0
+
+
+def frame_to_timecode(frame, rate):
+    """
+    SMPTE timecode of a frame, drop frame for 29.97/59.94
+
+    :param frame: int. frame number
+    :param rate: fractions.Fraction. frames per second
+    :return: str. 'HH:MM:SS:FF', or 'HH:MM:SS;FF' for drop frame
+    """
+    fps = int(round(rate))
+    separator = ':'
+    if is_drop_frame(rate):
+        separator = ';'
+        drop = fps // 15  # 2 for 29.97, 4 for 59.94
+        per_ten_minutes = fps * 600 - drop * 9
+        per_minute = fps * 60 - drop
+        tens, rest = divmod(frame, per_ten_minutes)
+        frame += drop * 9 * tens
+        if rest > drop:
+            frame += drop * ((rest - drop) // per_minute)
+
+    frames = frame % fps
+    seconds = frame // fps % 60
+    minutes = frame // (fps * 60) % 60
+    hours = frame // (fps * 3600)
+    return '{:02d}:{:02d}:{:02d}{}{:02d}'.format(
+        hours, minutes, seconds, separator, frames)
+
+
+def timecode_to_frame(timecode, rate):
+    """
+    :param timecode: str. 'HH:MM:SS:FF' or drop frame 'HH:MM:SS;FF'
+    :param rate: fractions.Fraction. frames per second
+    :return: int. frame number
+    """
+    hours, minutes, seconds, frames = [
+        int(part) for part in timecode.replace(';', ':').split(':')]
+    fps = int(round(rate))
+
+    frame = ((hours * 60 + minutes) * 60 + seconds) * fps + frames
+    if is_drop_frame(rate):
+        total_minutes = hours * 60 + minutes
+        frame -= fps // 15 * (total_minutes - total_minutes // 10)
+    return frame
+
+
+def frames_to_seconds(frames, rate):
+    """
+    Vectorized frame to seconds conversion
+
+    :param frames: numpy.ndarray. frame numbers
+    :param rate: fractions.Fraction. frames per second
+    :return: numpy.ndarray. float64 seconds
+    """
+    frames = np.asarray(frames)
+    return frames * float(rate.denominator) / float(rate.numerator)
+
+
+def frames_to_ticks(frames, rate, tick_rate):
+    """
+    Vectorized frame to tick conversion, exact in integer math
+
+    :param frames: numpy.ndarray. integer frame numbers in display rate
+    :param rate: fractions.Fraction. display frames per second
+    :param tick_rate: fractions.Fraction. ticks per second
+    :return: numpy.ndarray. int64 ticks, rounded half up
+    """
+    ratio = tick_rate / rate
+    frames = np.asarray(frames, dtype=np.int64)
+    return (2 * frames * ratio.numerator + ratio.denominator) \
+        // (2 * ratio.denominator)
+
+
+def seconds_to_frames(seconds, rate):
+    """
+    Vectorized seconds to nearest frame conversion
+
+    :param seconds: numpy.ndarray. seconds
+    :param rate: fractions.Fraction. frames per second
+    :return: numpy.ndarray. int64 frame numbers, rounded half up
+    """
+    seconds = np.asarray(seconds, dtype=np.float64)
+    frames = seconds * rate.numerator / rate.denominator
+    return np.floor(frames + 0.5).astype(np.int64)
@@ -0,0 +1,168 @@
+"""
+Level sequence hierarchy walker
+
+Expand a master sequence into a flat, depth first stream of every nested
+subsequence/shot section with its range remapped to master frames. Each
+sequence's own sections are read once and memoised, so a sub-sequence
+reused by many shots is only expanded a single time.
+"""
+
+import unreal
+
+from . import frametime, section, track
+
+
+class Node(object):
+    """
+    A nested section, start/end are master display frames (end exclusive)
+    and master = offset + scale * frame of the section sub-sequence
+    """
+    __slots__ = ('path', 'depth', 'u_section', 'sub_seq',
+                 'start', 'end', 'scale', 'offset')
+
+    def __init__(self, path, depth, u_section, sub_seq,
+                 start, end, scale, offset):
+        self.path = path
+        self.depth = depth
+        self.u_section = u_section
+        self.sub_seq = sub_seq
+        self.start = start
+        self.end = end
+        self.scale = scale
+        self.offset = offset
+
+    def __repr__(self):
+        return '<Node {} [{}-{}]>'.format(
+            self.path[-1], self.start, self.end)
+
+    def to_master(self, frame):
+        """
+        :param frame: float. frame of the section sub-sequence
+        :return: float. master display frame
+        """
+        return self.offset + self.scale * frame
+
+
+def _get_time_scale(params):
+    time_scale = params.get_editor_property('time_scale')
+    try:
+        return float(time_scale)
+    except TypeError:
+        # UE 5.5+ time warp variant
+        return float(time_scale.get_editor_property('fixed_play_rate'))
+
+
+class HierarchyWalker(object):
+
+    def __init__(self):
+        # sequence path: [(u_section, u_sub_seq, start, end, scale, offset)]
+        self.memo = dict()
+        # sequence path: (display rate, tick resolution)
+        self.rates = dict()
+
+    def get_rates(self, u_seq):
+        key = u_seq.get_path_name()
+        if key not in self.rates:
+            self.rates[key] = frametime.get_rates(u_seq, cached=False)
+        return self.rates[key]
+
+    def get_local(self, u_seq):
+        """
+        Read the sub sections of a sequence in its own frames, memoised
+
+        :param u_seq: unreal.MovieSceneSequence. u_seq asset
+        :return: [tuple]. (u_section, u_sub_seq, start, end, scale, offset)
+                 where parent frame = offset + scale * sub-sequence frame
+        """
+        key = u_seq.get_path_name()
+        if key in self.memo:
+            return self.memo[key]
+
+        entries = list()
+        rate = self.get_rates(u_seq)[0]
+        for u_track in u_seq.get_master_tracks():
+            if not isinstance(u_track, unreal.MovieSceneSubTrack):
+                continue
+
+            for u_section in track.get_sections(u_track):
+                u_sub_seq = section.get_sub_seq(u_section)
+                if not u_sub_seq:
+                    continue
+
+                params = u_section.get_editor_property('parameters')
+                sub_rate, sub_tick_rate = self.get_rates(u_sub_seq)
+                # the offset is stored in the sub-sequence tick resolution
+                frame_offset = float(frametime.tick_to_frame(
+                    params.get_editor_property('start_frame_offset').value,
+                    sub_rate, sub_tick_rate))
+                ratio = float(rate / sub_rate)
+                scale = ratio / _get_time_scale(params)
+
+                start = u_section.get_start_frame()
+                offset = start - (
+                    u_sub_seq.get_playback_start() + frame_offset) * scale
+                entries.append((u_section, u_sub_seq, start,
+                                u_section.get_end_frame(), scale, offset))
+
+        self.memo[key] = entries
+        return entries
+
+    def walk(self, u_master, max_depth=None):
+        """
+        Lazily iterate all nested sections of a master sequence, depth first
+
+        :param u_master: unreal.MovieSceneSequence. master u_seq asset
+        :param max_depth: int. (Optional) deepest level to expand, 0 being
+                          the master's own sections
+        :return: generator of Node.
+        """
+        master = u_master.get_path_name()
+        stack = [((master,), iter(self.get_local(u_master)), 1.0, 0.0)]
+        while stack:
+            path, entries, scale, offset = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            u_section, u_sub_seq, start, end, s_scale, s_offset = entry
+            sub_seq = u_sub_seq.get_path_name()
+            depth = len(path) - 1
+            node = Node(
+                path + (sub_seq,),
+                depth,
+                u_section,
+                sub_seq,
+                offset + scale * start,
+                offset + scale * end,
+                scale * s_scale,
+                offset + scale * s_offset
+            )
+            yield node
+
+            # guard against a sequence nesting itself
+            if sub_seq in path:
+                continue
+            if max_depth is None or depth < max_depth:
+                stack.append((node.path, iter(self.get_local(u_sub_seq)),
+                              node.scale, node.offset))
+
+    def flatten(self, u_master, max_depth=None):
+        """
+        :param u_master: unreal.MovieSceneSequence. master u_seq asset
+        :param max_depth: int. (Optional) deepest level to expand
+        :return: [Node].
+        """
+        return list(self.walk(u_master, max_depth))
+
+
+def walk(u_master, max_depth=None):
+    """
+    Lazily iterate all nested sections of a master sequence with a fresh
+    memo, see HierarchyWalker to share the memo across masters
+
+    :param u_master: unreal.MovieSceneSequence. master u_seq asset
+    :param max_depth: int. (Optional) deepest level to expand
+    :return: generator of Node.
+    """
+    return HierarchyWalker().walk(u_master, max_depth)
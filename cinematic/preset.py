@@ -1,9 +1,66 @@
 import unreal
 
 
+class OutputProfile(object):
+    """
+    Image outputs added to a preset, with rough per-frame characteristics
+    of 8-bit/half float RGBA frames, measure actual numbers for a project
+    with render.benchmark
+    """
+
+    def __init__(self, name, outputs, bytes_per_pixel, encode_cost):
+        """
+        :param name: str. profile name
+        :param outputs: [(unreal.Class, {str: object})]. image output setting
+                        classes and the editor properties to set on them
+        :param bytes_per_pixel: float. approximate disk size per pixel
+        :param encode_cost: float. approximate encode time relative to BMP
+        """
+        self.name = name
+        self.outputs = outputs
+        self.bytes_per_pixel = bytes_per_pixel
+        self.encode_cost = encode_cost
+
+    def __repr__(self):
+        return '<OutputProfile {}>'.format(self.name)
+
+    def estimate_frame_size(self, width, height):
+        """
+        :return: int. approximate bytes written per frame
+        """
+        return int(width * height * self.bytes_per_pixel)
+
+
+def _exr(compression):
+    """
+    :param compression: str. unreal.EXRCompressionFormat member name
+    """
+    return (
+        unreal.MoviePipelineImageSequenceOutput_EXR,
+        {'compression': getattr(unreal.EXRCompressionFormat, compression)}
+    )
+
+
+PNG = (unreal.MoviePipelineImageSequenceOutput_PNG, {})
+JPG = (unreal.MoviePipelineImageSequenceOutput_JPG, {})
+BMP = (unreal.MoviePipelineImageSequenceOutput_BMP, {})
+
+OUTPUT_PROFILES = {profile.name: profile for profile in [
+    OutputProfile('png', [PNG], 2.5, 10.0),
+    OutputProfile('jpg', [JPG], 0.3, 2.0),
+    OutputProfile('bmp', [BMP], 4.0, 1.0),
+    OutputProfile('exr', [_exr('PIZ')], 4.0, 3.0),
+    OutputProfile('exr_zip', [_exr('ZIP')], 4.0, 5.0),
+    OutputProfile('exr_none', [_exr('NONE')], 8.0, 1.5),
+    OutputProfile('exr+jpg', [_exr('PIZ'), JPG], 4.3, 5.0),
+]}
+
+
 @unreal.uclass()
 class MyPreset(unreal.MoviePipelineMasterConfig):
 
+    output_setting = unreal.uproperty(unreal.MoviePipelineOutputSetting)
+
     def __init__(self, preset):
         super(MyPreset, self).__init__(preset)
         self.copy_from(preset)
@@ -11,47 +68,68 @@ class MyPreset(unreal.MoviePipelineMasterConfig):
         self.set_file_name()
         self.set_flush_disk()
 
+    def get_output_setting(self):
+        """
+        Output setting of the preset, looked up once and cached
+
+        :return: unreal.MoviePipelineOutputSetting
+        """
+        if not self.output_setting:
+            self.output_setting = self.find_setting_by_class(
+                unreal.MoviePipelineOutputSetting
+            )
+        return self.output_setting
+
     @unreal.ufunction(ret=None, params=[])
     def set_flush_disk(self):
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         u_setting.flush_disk_writes_per_shot = True
 
     @unreal.ufunction(ret=None, params=[])
     def set_file_name(self):
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         u_setting.set_editor_property('zero_pad_frame_numbers', 5)
         u_setting.set_editor_property('file_name_format', r'{frame_number}')
 
     @classmethod
-    def get_base_preset(cls):
+    def get_base_preset(cls, profile='png', resolution=(1280, 720)):
+        """
+        Create a preset with a deferred render pass and image outputs
+
+        :param profile: str or OutputProfile. output profile, one of
+                        OUTPUT_PROFILES names
+        :param resolution: (int, int). output width and height
+        :return: MyPreset.
+        """
+        if not isinstance(profile, OutputProfile):
+            if profile not in OUTPUT_PROFILES:
+                raise ValueError('Output profile has to be one of {}'.format(
+                    sorted(OUTPUT_PROFILES)))
+            profile = OUTPUT_PROFILES[profile]
+
         u_preset = unreal.MoviePipelineMasterConfig()
         u_setting = u_preset.find_setting_by_class(
             unreal.MoviePipelineOutputSetting
         )
 
         # A job should have a render pass and a file output.
-        u_setting.output_resolution = unreal.IntPoint(1280, 720)
+        u_setting.output_resolution = unreal.IntPoint(*resolution)
 
         render_pass = u_preset.find_or_add_setting_by_class(
             unreal.MoviePipelineDeferredPassBase
         )
         render_pass.disable_multisample_effects = True
 
-        u_preset.find_or_add_setting_by_class(
-            unreal.MoviePipelineImageSequenceOutput_PNG
-        )
+        for u_class, properties in profile.outputs:
+            u_output = u_preset.find_or_add_setting_by_class(u_class)
+            for key, value in properties.items():
+                u_output.set_editor_property(key, value)
         u_preset.initialize_transient_settings()
         return cls(u_preset)
 
     @property
     def output_path(self):
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         return u_setting.get_editor_property('output_directory')
 
     @unreal.ufunction(ret=None, params=[str])
@@ -61,9 +139,7 @@ class MyPreset(unreal.MoviePipelineMasterConfig):
 
         @param path: str. absolute Windows path to render outputs
         """
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         u_setting.set_editor_property(
             'output_directory',
             unreal.DirectoryPath(path)
@@ -71,9 +147,7 @@ class MyPreset(unreal.MoviePipelineMasterConfig):
 
     @unreal.ufunction(ret=None, params=[int])
     def set_frame_rate(self, frame_rate):
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         u_setting.set_editor_property(
             'output_frame_rate',
             unreal.FrameRate(frame_rate, 1)
@@ -84,9 +158,7 @@ class MyPreset(unreal.MoviePipelineMasterConfig):
         if not width and not height:
             return
 
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         u_setting.set_editor_property(
             'output_resolution',
             unreal.IntPoint(width, height)
@@ -97,9 +169,89 @@ class MyPreset(unreal.MoviePipelineMasterConfig):
         if not start and not end:
             return
 
-        u_setting = self.find_setting_by_class(
-            unreal.MoviePipelineOutputSetting
-        )
+        u_setting = self.get_output_setting()
         u_setting.set_editor_property('use_custom_playback_range', True)
         u_setting.set_editor_property('custom_start_frame', start)
         u_setting.set_editor_property('custom_end_frame', end+1)
+
+    def apply_overrides(
+            self,
+            output_path=None,
+            frame_rate=None,
+            resolution=None,
+            frame_range=None
+    ):
+        """
+        Apply several output overrides in one call, None values are skipped
+
+        :param output_path: str. absolute Windows path to render outputs
+        :param frame_rate: int. output frame rate
+        :param resolution: (int, int). output width and height
+        :param frame_range: (int, int). inclusive start and end frame
+        """
+        if output_path is not None:
+            self.set_output_path(output_path)
+        if frame_rate is not None:
+            self.set_frame_rate(frame_rate)
+        if resolution is not None:
+            self.set_resolution(*resolution)
+        if frame_range is not None:
+            self.set_frame_range(*frame_range)
+
+
+class PresetPool(object):
+    """
+    Share MyPreset instances between jobs with identical settings
+
+    A preset is keyed by its base preset and overrides, so thousands of
+    per-shot configs that only differ by a few values are built once per
+    distinct combination. Jobs copy their configuration, so handing the same
+    preset to many jobs is safe.
+    """
+
+    def __init__(self):
+        self.presets = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.presets)
+
+    def get(
+            self,
+            base,
+            output_path=None,
+            frame_rate=None,
+            resolution=None,
+            frame_range=None
+    ):
+        """
+        Get a pooled preset, cloned from the base preset on first request
+
+        :param base: unreal.MoviePipelineMasterConfig. preset to clone
+        :param output_path: str. (Optional) see MyPreset.apply_overrides
+        :param frame_rate: int. (Optional)
+        :param resolution: (int, int). (Optional)
+        :param frame_range: (int, int). (Optional)
+        :return: MyPreset.
+        """
+        key = (
+            base.get_path_name(),
+            output_path,
+            frame_rate,
+            tuple(resolution) if resolution else None,
+            tuple(frame_range) if frame_range else None,
+        )
+        preset = self.presets.get(key)
+        if preset:
+            self.hits += 1
+            return preset
+
+        self.misses += 1
+        preset = MyPreset(base)
+        preset.apply_overrides(output_path, frame_rate, resolution, frame_range)
+        self.presets[key] = preset
+        return preset
+
+    def clear(self):
+        self.presets.clear()
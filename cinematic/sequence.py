@@ -1,15 +1,128 @@
+import os
+import time
+
 import unreal
 
+import path
+import registry
+
+from . import frametime, section, track
+
+
+# (sequence path, recursive): ({package path: save time}, [ShotInfo])
+SHOT_CACHE = dict()
+
+
+class ShotInfo(object):
+    """
+    Compact shot record, the frame range is inclusive and local to the
+    parent sequence
+    """
+    __slots__ = ('name', 'start', 'end', 'sub_seq', 'depth', 'parent')
+
+    def __init__(self, name, start, end, sub_seq, depth=0, parent=None):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.sub_seq = sub_seq
+        self.depth = depth
+        self.parent = parent
+
+    def __repr__(self):
+        return '<ShotInfo {} [{}-{}]>'.format(self.name, self.start, self.end)
+
 
-def get_shots(u_master):
-    [shot_track] = u_master.find_master_tracks_by_type(
+def get_shots(u_master, recursive=False, _depth=0, _stack=None):
+    """
+    Get shots of all cinematic shot tracks of a level u_seq
+
+    :param u_master: unreal.MovieSceneSequence. u_seq asset
+    :param recursive: bool. whether to also collect shots of the shot
+                      sub-sequences, depth first
+    :return: [ShotInfo].
+    """
+    parent = u_master.get_path_name()
+    stack = (_stack or set()) | {parent}
+
+    shots = list()
+    u_tracks = u_master.find_master_tracks_by_type(
         unreal.MovieSceneCinematicShotTrack)
-    shots = shot_track.get_sections()
-    for shot in shots:
-        name = shot.get_editor_property('SubSequence').get_name()
-        start = shot.get_start_frame()
-        end = shot.get_end_frame()-1
-        print(name, start, end)
+    for u_track in u_tracks:
+        for u_section in u_track.get_sections():
+            u_sub_seq = section.get_sub_seq(u_section)
+            sub_seq = u_sub_seq.get_path_name() if u_sub_seq else None
+            shots.append(ShotInfo(
+                u_sub_seq.get_name() if u_sub_seq else None,
+                u_section.get_start_frame(),
+                u_section.get_end_frame()-1,
+                sub_seq,
+                _depth,
+                parent
+            ))
+
+            # guard against a sequence nesting itself
+            if recursive and u_sub_seq and sub_seq not in stack:
+                shots.extend(
+                    get_shots(u_sub_seq, True, _depth+1, stack))
+
+    return shots
+
+
+def to_columns(shots):
+    """
+    Convert shot records to columnar lists
+
+    :param shots: [ShotInfo].
+    :return: {str: list}. one list per ShotInfo attribute
+    """
+    return {attr: [getattr(shot, attr) for shot in shots]
+            for attr in ShotInfo.__slots__}
+
+
+def _get_mtime(seq_path):
+    # to_sys_path only resolves object paths to a package file
+    package = seq_path.split('.')[0]
+    sys_path = path.to_sys_path(
+        '{}.{}'.format(package, package.rsplit('/', 1)[-1]))
+    return os.path.getmtime(sys_path) if os.path.isfile(sys_path) else None
+
+
+def get_shots_bulk(seq_paths, recursive=False):
+    """
+    Get shots of many level sequences, cached by package save time so
+    unchanged sequences are neither loaded nor read again. Recursive results
+    are only reused while every visited sub-sequence package is unchanged
+    too. Unsaved edits are not picked up until the package is saved.
+
+    :param seq_paths: [str]. Unreal package or object paths to level
+                      sequence assets
+    :param recursive: bool. whether to also collect nested shots
+    :return: {str: [ShotInfo]}. shots of each sequence path
+    """
+    results = dict()
+    for seq_path in seq_paths:
+        key = (seq_path, recursive)
+        cached = SHOT_CACHE.get(key)
+        if cached and all(
+                mtime is not None and _get_mtime(package) == mtime
+                for package, mtime in cached[0].items()):
+            results[seq_path] = cached[1]
+            continue
+
+        u_seq = unreal.load_asset(seq_path)
+        if not u_seq:
+            results[seq_path] = list()
+            continue
+
+        shots = get_shots(u_seq, recursive)
+        packages = {seq_path}
+        if recursive:
+            packages.update(shot.sub_seq for shot in shots if shot.sub_seq)
+        SHOT_CACHE[key] = (
+            {package: _get_mtime(package) for package in packages}, shots)
+        results[seq_path] = shots
+
+    return results
 
 
 def create_seq(u_folder, name):
@@ -28,17 +141,17 @@ def create_seq(u_folder, name):
         unreal.LevelSequence,
         unreal.LevelSequenceFactoryNew()
     )
+    registry.clear_cache('{}/{}'.format(u_folder.rstrip('/'), name))
     return u_sequence
 
 
 def get_framerate(u_seq):
     """
-    Get level u_seq framerate
+    Get level u_seq framerate, see `frametime.get_rate` for the exact value
 
-    :return: int.
+    :return: float.
     """
-    u_framerate = u_seq.get_display_rate()
-    return u_framerate.numerator / u_framerate.denominator
+    return float(frametime.get_rate(u_seq, cached=False))
 
 
 def get_range(u_seq):
@@ -77,9 +190,11 @@ def set_display_range(u_seq, start, end):
     if start >= end:
         raise ValueError('Start frame cannot be equal/greater than end frame')
 
-    framerate = get_framerate(u_seq)
-    u_seq.set_view_range_start(float(start) / framerate)
-    u_seq.set_view_range_end(float(end) / framerate)
+    framerate = frametime.get_rate(u_seq, cached=False)
+    u_seq.set_view_range_start(
+        float(frametime.frame_to_seconds(start, framerate)))
+    u_seq.set_view_range_end(
+        float(frametime.frame_to_seconds(end, framerate)))
 
     # TRACKS
 
@@ -148,14 +263,211 @@ def get_bounds(u_seq):
     return [u_seq_bound.binding_proxy for u_seq_bound in u_seq_bounds]
 
 
-def remove_binding(u_seq):
-    # https://forums.unrealengine.com/t/python-remove-binding-correctly-in-sequence/482501/3
-    bound_objects = get_bounds(u_seq)
+class BindingIndex(object):
+    """
+    Lookup of the level u_seq bindings by display name, GUID and bound actor,
+    built once per sequence. Bound actors are only resolved on first actor
+    lookup since that evaluates the sequence in the editor world.
+    """
+
+    def __init__(self, u_seq):
+        """
+        :param u_seq: unreal.MovieSceneSequence. u_seq asset
+        """
+        self.u_seq = u_seq
+        self.by_name = dict()
+        self.by_guid = dict()
+        self._by_actor = None
+
+        for u_binding in u_seq.get_bindings():
+            self.add(u_binding)
+
+    def add(self, u_binding):
+        """
+        :param u_binding: unreal.SequencerBindingProxy.
+        """
+        self.by_name.setdefault(u_binding.get_display_name(), []).append(
+            u_binding)
+        self.by_guid[str(u_binding.get_id())] = u_binding
+        self._by_actor = None
+
+    def discard(self, u_binding):
+        """
+        :param u_binding: unreal.SequencerBindingProxy.
+        """
+        name = u_binding.get_display_name()
+        u_bindings = [b for b in self.by_name.get(name, [])
+                      if b != u_binding]
+        if u_bindings:
+            self.by_name[name] = u_bindings
+        else:
+            self.by_name.pop(name, None)
+        self.by_guid.pop(str(u_binding.get_id()), None)
+        self._by_actor = None
+
+    def get_by_name(self, name):
+        """
+        :param name: str. binding display name
+        :return: [unreal.SequencerBindingProxy]. bindings sharing the name
+        """
+        return list(self.by_name.get(name, []))
+
+    def get_by_guid(self, guid):
+        """
+        :param guid: unreal.Guid or str.
+        :return: unreal.SequencerBindingProxy.
+        """
+        return self.by_guid.get(str(guid))
+
+    def get_by_actor(self, u_actor):
+        """
+        :param u_actor: unreal.Actor.
+        :return: unreal.SequencerBindingProxy.
+        """
+        if self._by_actor is None:
+            u_world = unreal.EditorLevelLibrary.get_editor_world()
+            u_seq_bounds = unreal.SequencerTools().get_bound_objects(
+                u_world,
+                self.u_seq,
+                self.u_seq.get_bindings(),
+                self.u_seq.get_playback_range()
+            )
+            self._by_actor = dict()
+            for u_seq_bound in u_seq_bounds:
+                for u_object in u_seq_bound.bound_objects:
+                    self._by_actor[u_object.get_path_name()] = \
+                        u_seq_bound.binding_proxy
+
+        return self._by_actor.get(u_actor.get_path_name())
+
+
+def remove_bindings(u_seq, names, index=None):
+    """
+    Remove bindings by display name, refreshing the sequencer once
+
+    https://forums.unrealengine.com/t/python-remove-binding-correctly-in-sequence/482501/3
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :param names: [str]. binding display names
+    :param index: BindingIndex. (Optional) index of the u_seq, kept up to
+                  date with the removals
+    :return: int. number of bindings removed
+    """
+    index = index or BindingIndex(u_seq)
+
+    count = 0
+    for name in set(names):
+        for u_binding in index.get_by_name(name):
+            for u_track in u_binding.get_tracks():
+                u_binding.remove_track(u_track)
+            u_binding.remove()
+            index.discard(u_binding)
+            count += 1
+
+    if count:
+        unreal.LevelSequenceEditorBlueprintLibrary.refresh_current_level_sequence()
+    return count
+
+
+def remove_binding(u_seq, name):
+    """
+    Remove bindings matching a display name
+
+    :param u_seq: unreal.MovieSceneSequence. u_seq asset
+    :param name: str. binding display name
+    :return: int. number of bindings removed
+    """
+    return remove_bindings(u_seq, [name])
+
+
+class BatchEdit(object):
+    """
+    Scope many track/section/binding edits of a level u_seq into one editor
+    transaction with a single sequencer refresh and a single save
+
+    Example:
+        with BatchEdit(u_seq) as batch:
+            u_track = batch.add_track(unreal.MovieSceneCinematicShotTrack)
+            u_section = batch.add_section(u_track)
+            batch.set_range(u_section, 0, 120)
+        print(batch.timings)
+    """
 
-    for bound_object in bound_objects:
-        if bound_object.binding_proxy.get_display_name() == 'binding_name':
-            tracks = bound_object.binding_proxy.get_tracks()
-            for track in tracks:
-                bound_object.binding_proxy.remove_track(track)
-            bound_object.binding_proxy.remove()
-            unreal.LevelSequenceEditorBlueprintLibrary.refresh_current_level_sequence()
+    def __init__(self, u_seq, description='Batch Sequence Edit', save=True):
+        """
+        :param u_seq: unreal.MovieSceneSequence. u_seq asset
+        :param description: str. undo history label of the transaction
+        :param save: bool. whether to save the u_seq asset on exit
+        """
+        self.u_seq = u_seq
+        self.description = description
+        self.save = save
+        self.operations = 0
+        self.timings = dict()
+        self._transaction = None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time()
+        self._transaction = unreal.ScopedEditorTransaction(self.description)
+        self._transaction.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        apply_end = time.time()
+        self._transaction.__exit__(exc_type, exc_val, exc_tb)
+        self._transaction = None
+
+        if exc_type:
+            return False
+
+        unreal.LevelSequenceEditorBlueprintLibrary.refresh_current_level_sequence()
+        refresh_end = time.time()
+
+        if self.save:
+            unreal.EditorAssetLibrary.save_loaded_asset(self.u_seq)
+        save_end = time.time()
+
+        self.timings = {
+            'operations': self.operations,
+            'apply': apply_end - self._start,
+            'refresh': refresh_end - apply_end,
+            'save': save_end - refresh_end,
+            'total': save_end - self._start,
+        }
+        unreal.log(
+            '{}: {} operations in {:.3f}s'.format(
+                self.description, self.operations, self.timings['total'])
+        )
+        return False
+
+    def run(self, func, *args):
+        """
+        Run an edit within the batch
+
+        :param func: callable. edit function
+        :return: the edit function result
+        """
+        self.operations += 1
+        return func(*args)
+
+    def add_track(self, typ, name=None):
+        return self.run(add_track, self.u_seq, typ, name)
+
+    def add_section(self, u_track):
+        return self.run(track.add_section, u_track)
+
+    def set_range(self, u_section, start, end):
+        return self.run(section.set_range, u_section, start, end)
+
+    def set_sub_seq(self, u_section, u_seq):
+        return self.run(section.set_sub_seq, u_section, u_seq)
+
+    def bind_actor(self, u_actor):
+        return self.run(bind_actor, self.u_seq, u_actor)
+
+    def bind_camera(self, u_section, u_binding):
+        return self.run(section.bind_camera, u_section, u_binding)
+
+    def set_skm_anim(self, u_section, u_anim_seq):
+        return self.run(section.set_skm_anim, u_section, u_anim_seq)
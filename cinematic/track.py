@@ -28,6 +28,16 @@ def add_section(u_track):
     return u_track.add_section()
 
 
+def remove_section(u_track, u_section):
+    """
+    Remove a section from the level u_seq track
+
+    :param u_track: unreal.MovieSceneTrack.
+    :param u_section: unreal.MovieSceneSection.
+    """
+    u_track.remove_section(u_section)
+
+
 def clear_sections(u_track):
     """
     Remove all sections of the level u_seq track
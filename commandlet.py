@@ -0,0 +1,220 @@
+"""
+Parallel headless commandlet runner
+
+Shard a work list (asset paths, .fbx files, sequences...) across several
+headless Unreal processes running a python script through the
+'pythonscript' commandlet, the same way render.renderCmd launches renders.
+Each process receives its shard in a temporary JSON file and writes a JSON
+result file back, results are merged in the original work list order.
+Process output goes to a log file per shard so a verbose worker never
+blocks on a full pipe.
+
+Example, driving side (no editor needed):
+    runner = Runner(UNREAL_EXE, U_PROJECT, 'C:/tools/audit_worker.py', 4)
+    results = runner.run(asset_paths)
+
+Worker script, executed inside each commandlet process:
+    import commandlet
+    commandlet.serve(lambda asset_path: do_something(asset_path))
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+
+def shard(items, count):
+    """
+    Split items into contiguous shards of near equal size
+
+    :param items: list. work items
+    :param count: int. number of shards
+    :return: [[(int, object)]]. shards of (work list index, item)
+    """
+    indexed = list(enumerate(items))
+    count = max(1, min(count, len(indexed)))
+    size, rest = divmod(len(indexed), count)
+
+    shards = list()
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < rest else 0)
+        shards.append(indexed[start:end])
+        start = end
+    return shards
+
+
+def get_command(unreal_exe, u_project, script, shard_file, result_file,
+                extra_flags=()):
+    """
+    :param unreal_exe: str. path to the Unreal editor commandline executable
+    :param u_project: str. path to the .uproject
+    :param script: str. path to the worker python script
+    :param shard_file: str. JSON file of the worker's shard
+    :param result_file: str. JSON file the worker writes its results to
+    :param extra_flags: [str]. additional process arguments
+    :return: [str].
+    """
+    command = [
+        unreal_exe,
+        u_project,
+        "-run=pythonscript",
+        "-script=\"%s %s %s\"" % (script, shard_file, result_file),
+
+        # headless
+        "-unattended",
+        "-nosplash",
+        "-nullrhi",
+        "-stdout",
+    ]
+    command.extend(extra_flags)
+    return command
+
+
+class Runner(object):
+
+    def __init__(self, unreal_exe, u_project, script, workers=4,
+                 extra_flags=(), timeout=None):
+        """
+        :param unreal_exe: str. path to the Unreal editor commandline
+                           executable
+        :param u_project: str. path to the .uproject
+        :param script: str. path to the worker python script
+        :param workers: int. number of processes
+        :param extra_flags: [str]. additional process arguments
+        :param timeout: float. (Optional) seconds from launch before killing
+                        the workers still running
+        """
+        self.unreal_exe = unreal_exe
+        self.u_project = u_project
+        self.script = script
+        self.workers = workers
+        self.extra_flags = list(extra_flags)
+        self.timeout = timeout
+        self.stats = dict()
+
+    def run(self, items):
+        """
+        Process items across the worker processes
+
+        :param items: list. JSON serializable work items
+        :return: [dict]. per item {'item', 'result'} or {'item', 'error'}
+                 in the work list order
+        """
+        start = time.time()
+        deadline = start + self.timeout if self.timeout else None
+        shards = shard(items, self.workers)
+        folder = tempfile.mkdtemp(prefix='commandlet_')
+        procs = list()
+        try:
+            for i, work in enumerate(shards):
+                shard_file = os.path.join(folder, 'shard_%s.json' % i)
+                result_file = os.path.join(folder, 'result_%s.json' % i)
+                log_file = os.path.join(folder, 'log_%s.txt' % i)
+                with open(shard_file, 'w') as f:
+                    json.dump(work, f)
+
+                command = get_command(
+                    self.unreal_exe, self.u_project, self.script,
+                    shard_file, result_file, self.extra_flags)
+                log = open(log_file, 'wb')
+                try:
+                    proc = subprocess.Popen(
+                        command,
+                        stdout=log,
+                        stderr=subprocess.STDOUT
+                    )
+                except OSError:
+                    log.close()
+                    raise
+                procs.append((proc, log, work, result_file))
+
+            results = [None] * len(items)
+            failed = 0
+            for proc, log, work, result_file in procs:
+                error = self.wait(proc, deadline, log)
+                if not error and not os.path.isfile(result_file):
+                    error = 'No result written'
+                if error:
+                    failed += 1
+                    for index, item in work:
+                        results[index] = {'item': item, 'error': error}
+                    continue
+
+                with open(result_file) as f:
+                    for record in json.load(f):
+                        results[record.pop('index')] = record
+        finally:
+            for proc, log, _, _ in procs:
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                log.close()
+            shutil.rmtree(folder, ignore_errors=True)
+
+        self.stats = {
+            'items': len(items),
+            'shards': len(shards),
+            'failed_shards': failed,
+            'seconds': time.time() - start,
+        }
+        return results
+
+    def wait(self, proc, deadline=None, log=None):
+        """
+        :param proc: subprocess.Popen. worker process
+        :param deadline: float. (Optional) time.time() to kill the worker at
+        :param log: file. (Optional) log file of the worker output
+        :return: str. error message, None if the process exited cleanly
+        """
+        timeout = max(0, deadline - time.time()) if deadline else None
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            return 'Timed out'
+
+        if proc.returncode:
+            tail = b''
+            if log is not None:
+                log.flush()
+                with open(log.name, 'rb') as f:
+                    f.seek(max(0, os.path.getsize(log.name) - 2000))
+                    tail = f.read()
+            return 'Exit code {}\n{}'.format(
+                proc.returncode, tail.decode(errors='replace'))
+        return None
+
+
+def serve(func, argv=None):
+    """
+    Worker side: process the shard given on the command line and write the
+    results, exceptions are reported per item
+
+    :param func: callable. receives one work item, returns a JSON
+                 serializable result
+    :param argv: [str]. (Optional) script arguments, defaults to sys.argv
+    """
+    argv = argv or sys.argv
+    shard_file, result_file = argv[-2:]
+    with open(shard_file) as f:
+        work = json.load(f)
+
+    records = list()
+    for index, item in work:
+        try:
+            records.append(
+                {'index': index, 'item': item, 'result': func(item)})
+        except Exception:
+            records.append(
+                {'index': index, 'item': item,
+                 'error': traceback.format_exc()})
+
+    with open(result_file, 'w') as f:
+        json.dump(records, f)
@@ -1,7 +1,15 @@
 import os
+import time
+from collections import namedtuple
 
 import unreal
 
+import registry
+
+
+# planned engine operation of the bulk asset functions
+Operation = namedtuple('Operation', 'action source target')
+
 
 def get_selected_asset():
     """
@@ -22,14 +30,19 @@ def get_asset(path):
     return unreal.EditorAssetLibrary.find_asset_data(path).get_asset()
 
 
-def get_assets_from_folder(folder):
+def get_assets_from_folder(folder, cached=False):
     """
     Get certain types of assets from a directory
 
     :param folder: str. search directory
+    :param cached: bool. read through the session registry cache, see
+                   `registry`
     :return: [unreal.Object].
     """
-    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    if cached:
+        asset_registry = registry.get_registry()
+    else:
+        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
     asset_datas = asset_registry.get_assets_by_path(folder)
 
     return [asset_data.get_asset() for asset_data in asset_datas]
@@ -80,3 +93,151 @@ def get_actor(label):
         return None
     else:
         return matches[0]
+
+
+def _report(operations, start, dry_run, failed=()):
+    seconds = time.time() - start
+    return {
+        'operations': operations,
+        'count': len(operations),
+        'failed': list(failed),
+        'dry_run': dry_run,
+        'seconds': seconds,
+        'per_second': len(operations) / seconds if seconds else None,
+    }
+
+
+def create_folder_tree(root, tree, dry_run=False):
+    """
+    Create a tree of Unreal folders, skipping duplicates and existing ones
+
+    Example:
+        create_folder_tree('/Game/Shots', {'sh010': ['anim', 'cam'],
+                                           'sh020': ['anim', 'cam']})
+
+    :param root: str. directory root
+    :param tree: dict or list. nested {folder: children} or [folder]
+    :param dry_run: bool. only plan the operations
+    :return: dict. 'operations', 'count', 'failed', 'dry_run', 'seconds'
+             and 'per_second'
+    """
+    start = time.time()
+
+    def walk(parent, node):
+        if isinstance(node, dict):
+            for name, children in node.items():
+                path = '/'.join([parent.rstrip('/'), name])
+                yield path
+                for child in walk(path, children or []):
+                    yield child
+        else:
+            for name in node:
+                yield '/'.join([parent.rstrip('/'), name])
+
+    paths = list(dict.fromkeys(walk(root, tree)))
+    if not dry_run:
+        paths = [path for path in paths
+                 if not unreal.EditorAssetLibrary.does_directory_exist(path)]
+    operations = [Operation('make_directory', None, path) for path in paths]
+    if dry_run:
+        return _report(operations, start, dry_run)
+
+    # make_directory creates missing parents, deepest first saves calls
+    failed = list()
+    created = set()
+    for path in sorted(paths, key=lambda p: -p.count('/')):
+        if path in created:
+            continue
+        if not unreal.EditorAssetLibrary.make_directory(path):
+            failed.append(path)
+            continue
+        parent = path
+        while '/' in parent.strip('/'):
+            created.add(parent)
+            parent = parent.rsplit('/', 1)[0]
+
+    return _report(operations, start, dry_run, failed)
+
+
+def move_assets(moves, dry_run=False):
+    """
+    Move/rename many assets in a single rename call
+
+    :param moves: [(str, str)]. source asset path and target asset path
+                  (e.g. '/Game/A/Mesh', '/Game/B/Mesh_New')
+    :param dry_run: bool. only plan the operations
+    :return: dict. see `create_folder_tree`
+    """
+    start = time.time()
+
+    # last target wins for a duplicated source, no-op moves are skipped
+    targets = dict()
+    for source, target in moves:
+        source = source.split('.')[0]
+        target = target.split('.')[0]
+        if source != target:
+            targets[source] = target
+
+    operations = [Operation('rename', source, target)
+                  for source, target in targets.items()]
+    if dry_run:
+        return _report(operations, start, dry_run)
+
+    failed = list()
+    rename_datas = list()
+    for operation in operations:
+        u_asset = unreal.EditorAssetLibrary.load_asset(operation.source)
+        if not u_asset:
+            failed.append(operation.source)
+            continue
+        folder, name = operation.target.rsplit('/', 1)
+        rename_datas.append(unreal.AssetRenameData(u_asset, folder, name))
+
+    if rename_datas:
+        u_asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        if not u_asset_tools.rename_assets(rename_datas):
+            failed.extend(op.source for op in operations
+                          if op.source not in failed)
+        for operation in operations:
+            registry.clear_cache(operation.source)
+            registry.clear_cache(operation.target)
+
+    return _report(operations, start, dry_run, failed)
+
+
+def save_assets(assets, only_dirty=True, dry_run=False):
+    """
+    Save many assets in a single save call
+
+    :param assets: [unreal.Object or str]. loaded assets or asset paths
+    :param only_dirty: bool. skip packages without unsaved changes
+    :param dry_run: bool. only plan the operations
+    :return: dict. see `create_folder_tree`
+    """
+    start = time.time()
+
+    # one save per package
+    packages = dict()
+    for asset in assets:
+        if isinstance(asset, str):
+            packages.setdefault(asset.split('.')[0], asset)
+        else:
+            packages.setdefault(asset.get_outermost().get_name(), asset)
+
+    operations = [Operation('save', package, None) for package in packages]
+    if dry_run:
+        return _report(operations, start, dry_run)
+
+    u_assets = dict()
+    for package, asset in packages.items():
+        if isinstance(asset, str):
+            asset = unreal.EditorAssetLibrary.load_asset(asset)
+        if asset:
+            u_assets[package] = asset
+
+    failed = [package for package in packages if package not in u_assets]
+    if u_assets and not unreal.EditorAssetLibrary.save_loaded_assets(
+            list(u_assets.values()), only_if_is_dirty=only_dirty):
+        failed.extend(u_assets)
+
+    return _report(operations, start, dry_run, failed)
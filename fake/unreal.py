@@ -0,0 +1,1566 @@
+"""
+Offline stand-in for the `unreal` module
+
+An in-memory implementation of the subset of the engine API this library
+uses (asset registry, editor asset library, asset tools import tasks, level
+sequences with tracks/sections/bindings, movie pipeline queue/executors and
+tool menus) so the modules can be imported, exercised and benchmarked on
+Linux without an editor.
+
+Usage:
+    import sys
+    sys.path.insert(0, '<unrealUtil>/fake')
+    import unreal  # this module
+
+    unreal.LATENCIES['EditorAssetLibrary.make_directory'] = 0.002
+    unreal.add_asset('/Game/Maps/Main', unreal.World, size=1024)
+
+Every engine call sleeps for its configured latency (DEFAULT_LATENCY when not
+configured) and is counted in CALLS, `reset()` clears all state.
+"""
+
+import logging
+import math
+import os
+import re
+import tempfile
+import time
+import uuid
+from collections import Counter
+from functools import wraps
+
+
+# api name: seconds slept per call
+LATENCIES = dict()
+DEFAULT_LATENCY = 0.0
+# api name: number of calls
+CALLS = Counter()
+
+CONTENT_DIR = os.path.join(
+    tempfile.gettempdir(), 'FakeUnrealProject', 'Content') + '/'
+
+logger = logging.getLogger('unreal')
+
+
+def _api(name):
+    """
+    Count an engine call and simulate its latency
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            CALLS[name] += 1
+            latency = LATENCIES.get(name, DEFAULT_LATENCY)
+            if latency:
+                time.sleep(latency)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def log(message):
+    logger.info(message)
+
+
+def log_warning(message):
+    logger.warning(message)
+
+
+def log_error(message, *args):
+    logger.error(message, *args)
+
+
+# ---------------------------------------------------------------------------
+# reflection decorators
+
+
+def uclass():
+    return lambda cls: cls
+
+
+def ufunction(**kwargs):
+    return lambda func: func
+
+
+def uproperty(typ, **kwargs):
+    return None
+
+
+# ---------------------------------------------------------------------------
+# value types
+
+
+class _Enum(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def _enum(name, members):
+    return type(name, (object,), {m: _Enum(m) for m in members})
+
+
+SequenceTimeUnit = _enum('SequenceTimeUnit', ['DISPLAY_RATE', 'TICK_RESOLUTION'])
+RichCurveTangentMode = _enum(
+    'RichCurveTangentMode', ['RCTM_AUTO', 'RCTM_USER', 'RCTM_BREAK'])
+MovieSceneKeyInterpolation = _enum(
+    'MovieSceneKeyInterpolation', ['AUTO', 'USER', 'BREAK', 'LINEAR', 'CONSTANT'])
+MovieSceneCompletionMode = _enum(
+    'MovieSceneCompletionMode', ['KEEP_STATE', 'RESTORE_STATE'])
+EXRCompressionFormat = _enum(
+    'EXRCompressionFormat', ['NONE', 'PIZ', 'ZIP', 'DWAA', 'DWAB'])
+FBXImportType = _enum(
+    'FBXImportType',
+    ['FBXIT_STATIC_MESH', 'FBXIT_SKELETAL_MESH', 'FBXIT_ANIMATION'])
+MultiBlockType = _enum(
+    'MultiBlockType', ['MENU_ENTRY', 'TOOL_BAR_BUTTON', 'SEPARATOR'])
+ToolMenuStringCommandType = _enum(
+    'ToolMenuStringCommandType', ['COMMAND', 'PYTHON', 'CUSTOM'])
+
+
+class Name(str):
+    pass
+
+
+class Guid(object):
+
+    def __init__(self, value=None):
+        self.value = value or uuid.uuid4().hex.upper()
+
+    def __str__(self):
+        return self.value
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class FrameNumber(object):
+
+    def __init__(self, value=0):
+        self.value = int(value)
+
+    def __repr__(self):
+        return 'FrameNumber({})'.format(self.value)
+
+
+class FrameTime(object):
+
+    def __init__(self, frame_number=None, sub_frame=0.0):
+        self.frame_number = frame_number or FrameNumber(0)
+        self.sub_frame = sub_frame
+
+
+class FrameRate(object):
+
+    def __init__(self, numerator=30, denominator=1):
+        self.numerator = numerator
+        self.denominator = denominator
+
+
+class IntPoint(object):
+
+    def __init__(self, x=0, y=0):
+        self.x = x
+        self.y = y
+
+
+class DirectoryPath(object):
+
+    def __init__(self, path=''):
+        self.path = path
+
+
+class SoftObjectPath(object):
+
+    def __init__(self, path=''):
+        self.path = path
+
+    def export_text(self):
+        return self.path
+
+
+class SequencerScriptingRange(object):
+
+    def __init__(self, start, end):
+        self.inclusive_start = start
+        self.exclusive_end = end
+
+
+class _Delegate(object):
+
+    def __init__(self):
+        self.callables = list()
+
+    def add_callable(self, func):
+        self.callables.append(func)
+
+    def add_callable_unique(self, func):
+        if func not in self.callables:
+            self.callables.append(func)
+
+    def remove_callable(self, func):
+        self.callables.remove(func)
+
+    def broadcast(self, *args):
+        for func in list(self.callables):
+            func(*args)
+
+    def copy(self):
+        delegate = type(self)()
+        delegate.callables = list(self.callables)
+        return delegate
+
+
+def _snake(name):
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+
+
+# ---------------------------------------------------------------------------
+# objects
+
+
+class Object(object):
+
+    def __init__(self, outer=None, name=None):
+        self._outer = outer
+        self._name = name or type(self).__name__
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self.get_path_name())
+
+    def get_name(self):
+        return self._name
+
+    def get_outer(self):
+        return self._outer
+
+    def get_outermost(self):
+        obj = self
+        while obj.get_outer() is not None:
+            obj = obj.get_outer()
+        return obj
+
+    def get_path_name(self):
+        if self._outer is None:
+            return self._name
+        return '{}:{}'.format(self._outer.get_path_name(), self._name)
+
+    def get_class(self):
+        return type(self)
+
+    def get_editor_property(self, name):
+        if hasattr(self, name):
+            return getattr(self, name)
+        return getattr(self, _snake(name))
+
+    def set_editor_property(self, name, value):
+        setattr(self, name if hasattr(self, name) else _snake(name), value)
+
+
+class _Asset(Object):
+    """
+    Base of the objects registered as assets, path is '/Game/Dir/Name'
+    """
+
+    def __init__(self, outer=None, name=None):
+        super(_Asset, self).__init__(outer, name)
+        self.package_name = None
+        self.disk_size = 0
+        self.dirty = True
+
+    def get_path_name(self):
+        if self.package_name:
+            return '{}.{}'.format(self.package_name, self.get_name())
+        return super(_Asset, self).get_path_name()
+
+
+class World(_Asset):
+    pass
+
+
+class Actor(Object):
+
+    def __init__(self, label='Actor'):
+        super(Actor, self).__init__(None, label)
+        self.label = label
+
+    def get_actor_label(self):
+        return self.label
+
+
+class CineCameraActor(Actor):
+    pass
+
+
+class SkeletalMeshActor(Actor):
+    pass
+
+
+class AnimSequence(_Asset):
+    pass
+
+
+class Skeleton(_Asset):
+    pass
+
+
+class SkeletalMesh(_Asset):
+    pass
+
+
+class StaticMesh(_Asset):
+    pass
+
+
+class Texture2D(_Asset):
+    pass
+
+
+class Material(_Asset):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# asset registry
+
+
+class TopLevelAssetPath(object):
+
+    def __init__(self, package_name, asset_name):
+        self.package_name = Name(package_name)
+        self.asset_name = Name(asset_name)
+
+
+class AssetData(object):
+
+    def __init__(self, asset=None):
+        self._asset = asset
+        if asset:
+            self.package_name = Name(asset.package_name)
+            self.asset_name = Name(asset.get_name())
+            self.asset_class_path = TopLevelAssetPath(
+                '/Script/Engine', type(asset).__name__)
+            self.object_path = Name(asset.get_path_name())
+        else:
+            self.package_name = Name('None')
+            self.asset_name = Name('None')
+            self.asset_class_path = TopLevelAssetPath('None', 'None')
+            self.object_path = Name('None')
+
+    def is_valid(self):
+        return self._asset is not None
+
+    @_api('AssetData.get_asset')
+    def get_asset(self):
+        return self._asset
+
+
+class AssetRegistryDependencyOptions(object):
+
+    def __init__(self, include_soft_package_references=True,
+                 include_hard_package_references=True,
+                 include_searchable_names=False,
+                 include_soft_management_references=False,
+                 include_hard_management_references=False):
+        self.include_soft_package_references = include_soft_package_references
+        self.include_hard_package_references = include_hard_package_references
+
+
+# package name: asset
+ASSETS = dict()
+# package name: set(dependency package names)
+DEPENDENCIES = dict()
+# Unreal folders created with make_directory
+DIRECTORIES = set()
+
+
+def _package(path):
+    return str(path).split('.')[0].rstrip('/')
+
+
+def add_asset(path, cls=Object, dependencies=(), size=0):
+    """
+    Register an asset, test/benchmark setup helper, no latency
+
+    :param path: str. package path e.g. '/Game/Props/Chair'
+    :param cls: type. asset class, subclasses of Object
+    :param dependencies: [str]. dependency package names
+    :param size: int. bytes written to the content folder on save
+    :return: Object.
+    """
+    package = _package(path)
+    asset = cls(None, package.rsplit('/', 1)[-1])
+    if not isinstance(asset, _Asset):
+        asset.dirty = True
+    asset.package_name = package
+    asset.disk_size = size
+    ASSETS[package] = asset
+    DEPENDENCIES[package] = set(_package(d) for d in dependencies)
+    DIRECTORIES.add(package.rsplit('/', 1)[0])
+    return asset
+
+
+def remove_asset(path):
+    """
+    Unregister an asset, test/benchmark setup helper, no latency
+
+    :param path: str. package path
+    """
+    ASSETS.pop(_package(path), None)
+    DEPENDENCIES.pop(_package(path), None)
+
+
+def _register(asset, folder, name):
+    asset._name = name
+    asset.package_name = '{}/{}'.format(folder.rstrip('/'), name)
+    asset.dirty = True
+    ASSETS[asset.package_name] = asset
+    DEPENDENCIES.setdefault(asset.package_name, set())
+    DIRECTORIES.add(folder.rstrip('/'))
+    return asset
+
+
+class AssetRegistry(Object):
+
+    @_api('AssetRegistry.get_assets_by_path')
+    def get_assets_by_path(self, package_path, recursive=False,
+                           include_only_on_disk_assets=False):
+        folder = str(package_path).rstrip('/')
+        results = list()
+        for package, asset in ASSETS.items():
+            parent = package.rsplit('/', 1)[0]
+            if parent == folder or (
+                    recursive and parent.startswith(folder + '/')):
+                results.append(AssetData(asset))
+        return results
+
+    @_api('AssetRegistry.get_assets_by_package_name')
+    def get_assets_by_package_name(self, package_name,
+                                   include_only_on_disk_assets=False):
+        asset = ASSETS.get(_package(package_name))
+        return [AssetData(asset)] if asset else []
+
+    @_api('AssetRegistry.get_asset_by_object_path')
+    def get_asset_by_object_path(self, object_path):
+        return AssetData(ASSETS.get(_package(object_path)))
+
+    @_api('AssetRegistry.get_dependencies')
+    def get_dependencies(self, package_name, dependency_options=None):
+        package = _package(package_name)
+        if package not in DEPENDENCIES:
+            return None
+        return [Name(dep) for dep in sorted(DEPENDENCIES[package])]
+
+    @_api('AssetRegistry.get_referencers')
+    def get_referencers(self, package_name, reference_options=None):
+        package = _package(package_name)
+        referencers = [Name(p) for p, deps in DEPENDENCIES.items()
+                       if package in deps]
+        return sorted(referencers) or None
+
+
+_REGISTRY = AssetRegistry()
+
+
+class AssetRegistryHelpers(object):
+
+    @staticmethod
+    @_api('AssetRegistryHelpers.get_asset_registry')
+    def get_asset_registry():
+        return _REGISTRY
+
+
+def _sys_path(package):
+    return os.path.join(CONTENT_DIR, package[len('/Game/'):] + '.uasset')
+
+
+class EditorAssetLibrary(object):
+
+    @staticmethod
+    @_api('EditorAssetLibrary.find_asset_data')
+    def find_asset_data(asset_path):
+        return AssetData(ASSETS.get(_package(asset_path)))
+
+    @staticmethod
+    @_api('EditorAssetLibrary.load_asset')
+    def load_asset(asset_path):
+        return ASSETS.get(_package(asset_path))
+
+    @staticmethod
+    @_api('EditorAssetLibrary.does_asset_exist')
+    def does_asset_exist(asset_path):
+        return _package(asset_path) in ASSETS
+
+    @staticmethod
+    @_api('EditorAssetLibrary.does_directory_exist')
+    def does_directory_exist(directory_path):
+        return str(directory_path).rstrip('/') in DIRECTORIES
+
+    @staticmethod
+    @_api('EditorAssetLibrary.make_directory')
+    def make_directory(directory_path):
+        path = str(directory_path).replace('\\', '/').rstrip('/')
+        while path.count('/') > 1:
+            DIRECTORIES.add(path)
+            path = path.rsplit('/', 1)[0]
+        return True
+
+    @staticmethod
+    def _save(asset, only_if_is_dirty):
+        if only_if_is_dirty and not getattr(asset, 'dirty', True):
+            return
+        package = getattr(asset, 'package_name', None)
+        if not package:
+            return
+        sys_path = _sys_path(package)
+        if not os.path.isdir(os.path.dirname(sys_path)):
+            os.makedirs(os.path.dirname(sys_path))
+        with open(sys_path, 'wb') as f:
+            f.write(b'\0' * getattr(asset, 'disk_size', 0))
+        asset.dirty = False
+
+    @staticmethod
+    @_api('EditorAssetLibrary.save_loaded_asset')
+    def save_loaded_asset(asset_to_save, only_if_is_dirty=True):
+        EditorAssetLibrary._save(asset_to_save, only_if_is_dirty)
+        return True
+
+    @staticmethod
+    @_api('EditorAssetLibrary.save_loaded_assets')
+    def save_loaded_assets(assets_to_save, only_if_is_dirty=True):
+        for asset in assets_to_save:
+            EditorAssetLibrary._save(asset, only_if_is_dirty)
+        return True
+
+
+# assets selected in the content browser
+SELECTION = list()
+
+
+class EditorUtilityLibrary(object):
+
+    @staticmethod
+    @_api('EditorUtilityLibrary.get_selected_assets')
+    def get_selected_assets():
+        return list(SELECTION)
+
+
+class SystemLibrary(object):
+
+    @staticmethod
+    def convert_to_absolute_path(filename):
+        return os.path.abspath(filename).replace('\\', '/') + (
+            '/' if filename.endswith('/') else '')
+
+
+class Paths(object):
+
+    @staticmethod
+    def project_content_dir():
+        return CONTENT_DIR
+
+
+# ---------------------------------------------------------------------------
+# asset tools
+
+
+class Factory(Object):
+    pass
+
+
+class LevelSequenceFactoryNew(Factory):
+    pass
+
+
+class FbxImportUI(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(FbxImportUI, self).__init__(outer, name)
+        self.automated_import_should_detect_type = True
+        self.mesh_type_to_import = FBXImportType.FBXIT_STATIC_MESH
+        self.import_animations = False
+        self.import_as_skeletal = False
+        self.import_materials = True
+        self.import_textures = True
+        self.import_mesh = True
+        self.import_rigid_mesh = False
+        self.create_physics_asset = False
+        self.skeleton = None
+
+
+class AssetImportTask(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(AssetImportTask, self).__init__(outer, name)
+        self.automated = False
+        self.destination_path = ''
+        self.destination_name = ''
+        self.filename = ''
+        self.options = None
+        self.replace_existing = False
+        self.save = False
+        self.imported_object_paths = list()
+
+
+class AssetImportData(Object):
+
+    def __init__(self, filename=''):
+        super(AssetImportData, self).__init__()
+        self.filename = filename
+
+    def get_first_filename(self):
+        return self.filename
+
+
+class AssetRenameData(object):
+
+    def __init__(self, asset=None, new_package_path='', new_name=''):
+        self.asset = asset
+        self.new_package_path = new_package_path
+        self.new_name = new_name
+
+
+class AssetTools(Object):
+
+    @_api('AssetTools.create_asset')
+    def create_asset(self, asset_name, package_path, asset_class, factory):
+        return _register(asset_class(), package_path, asset_name)
+
+    @_api('AssetTools.import_asset_tasks')
+    def import_asset_tasks(self, import_tasks):
+        for task in import_tasks:
+            cls = StaticMesh
+            options = task.options
+            if options is not None:
+                if options.mesh_type_to_import is \
+                        FBXImportType.FBXIT_SKELETAL_MESH:
+                    cls = SkeletalMesh
+                elif options.mesh_type_to_import is \
+                        FBXImportType.FBXIT_ANIMATION:
+                    cls = AnimSequence
+            name = task.destination_name or os.path.splitext(
+                os.path.basename(task.filename))[0]
+            asset = _register(cls(), task.destination_path, name)
+            asset.asset_import_data = AssetImportData(task.filename)
+            if task.save:
+                EditorAssetLibrary._save(asset, False)
+            task.imported_object_paths = [asset.get_path_name()]
+
+    @_api('AssetTools.rename_assets')
+    def rename_assets(self, assets_and_names):
+        for data in assets_and_names:
+            old = data.asset.package_name
+            ASSETS.pop(old, None)
+            deps = DEPENDENCIES.pop(old, set())
+            data.asset._name = data.new_name
+            data.asset.package_name = '{}/{}'.format(
+                data.new_package_path.rstrip('/'), data.new_name)
+            ASSETS[data.asset.package_name] = data.asset
+            DIRECTORIES.add(data.new_package_path.rstrip('/'))
+            DEPENDENCIES[data.asset.package_name] = deps
+            for dependencies in DEPENDENCIES.values():
+                if old in dependencies:
+                    dependencies.discard(old)
+                    dependencies.add(data.asset.package_name)
+        return True
+
+
+_ASSET_TOOLS = AssetTools()
+
+
+class AssetToolsHelpers(object):
+
+    @staticmethod
+    @_api('AssetToolsHelpers.get_asset_tools')
+    def get_asset_tools():
+        return _ASSET_TOOLS
+
+
+# ---------------------------------------------------------------------------
+# level editor
+
+
+_WORLD = World(None, 'FakeWorld')
+# actors of the editor world
+ACTORS = list()
+
+
+def add_actor(label, cls=Actor):
+    """
+    Spawn an actor in the editor world, setup helper, no latency
+
+    :param label: str. actor label
+    :param cls: type. actor class
+    :return: Actor.
+    """
+    actor = cls(label)
+    ACTORS.append(actor)
+    return actor
+
+
+class EditorLevelLibrary(object):
+
+    @staticmethod
+    @_api('EditorLevelLibrary.get_editor_world')
+    def get_editor_world():
+        return _WORLD
+
+
+class GameplayStatics(object):
+
+    @staticmethod
+    @_api('GameplayStatics.get_all_actors_of_class')
+    def get_all_actors_of_class(world_context_object, actor_class):
+        return [actor for actor in ACTORS if isinstance(actor, actor_class)]
+
+
+TRANSACTIONS = list()
+
+
+class ScopedEditorTransaction(object):
+
+    def __init__(self, description):
+        self.description = description
+
+    def __enter__(self):
+        CALLS['ScopedEditorTransaction'] += 1
+        TRANSACTIONS.append(self.description)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# sequencer
+
+
+class MovieSceneScriptingKey(object):
+
+    def __init__(self, time, value, ticks_per_frame=800.0):
+        # key time in ticks, ticks_per_frame converts to the display rate
+        self.time = int(time)
+        self.value = value
+        self.ticks_per_frame = ticks_per_frame
+        self.arrive_tangent = 0.0
+        self.leave_tangent = 0.0
+        self.tangent_mode = RichCurveTangentMode.RCTM_AUTO
+
+    def get_time(self, time_unit=SequenceTimeUnit.DISPLAY_RATE):
+        if time_unit is SequenceTimeUnit.TICK_RESOLUTION:
+            return FrameTime(FrameNumber(self.time))
+        frames = self.time / self.ticks_per_frame
+        frame = math.floor(frames)
+        return FrameTime(FrameNumber(frame), frames - frame)
+
+    def get_value(self):
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+
+    def get_arrive_tangent(self):
+        return self.arrive_tangent
+
+    def set_arrive_tangent(self, value):
+        self.arrive_tangent = value
+
+    def get_leave_tangent(self):
+        return self.leave_tangent
+
+    def set_leave_tangent(self, value):
+        self.leave_tangent = value
+
+    def set_tangent_mode(self, mode):
+        self.tangent_mode = mode
+
+
+class MovieSceneScriptingChannel(Object):
+
+    def __init__(self, outer=None, name='Value'):
+        super(MovieSceneScriptingChannel, self).__init__(outer, name)
+        self.channel_name = Name(name)
+        self.keys = list()
+
+    @_api('MovieSceneScriptingChannel.get_keys')
+    def get_keys(self):
+        return list(self.keys)
+
+    def _ticks_per_frame(self):
+        # display and tick rates of the owning sequence, engine defaults
+        # for channels outside of one
+        display_rate, tick_resolution = FrameRate(30, 1), FrameRate(24000, 1)
+        outer = self.get_outer()
+        while outer is not None:
+            if isinstance(outer, MovieSceneSequence):
+                display_rate = outer.get_display_rate()
+                tick_resolution = outer.get_tick_resolution()
+                break
+            outer = outer.get_outer()
+        return (tick_resolution.numerator * display_rate.denominator) / \
+            float(tick_resolution.denominator * display_rate.numerator)
+
+    @_api('MovieSceneScriptingChannel.add_key')
+    def add_key(self, time, new_value, sub_frame=0.0,
+                time_unit=SequenceTimeUnit.DISPLAY_RATE, interpolation=None):
+        ticks_per_frame = self._ticks_per_frame()
+        ticks = time.value
+        if time_unit is not SequenceTimeUnit.TICK_RESOLUTION:
+            ticks = round((time.value + sub_frame) * ticks_per_frame)
+        key = MovieSceneScriptingKey(ticks, new_value, ticks_per_frame)
+        self.keys.append(key)
+        self.keys.sort(key=lambda k: k.time)
+        return key
+
+    @_api('MovieSceneScriptingChannel.remove_key')
+    def remove_key(self, key):
+        self.keys.remove(key)
+
+
+class MovieSceneScriptingFloatChannel(MovieSceneScriptingChannel):
+    pass
+
+
+class MovieSceneScriptingDoubleChannel(MovieSceneScriptingChannel):
+    pass
+
+
+class MovieSceneSectionParameters(object):
+
+    def __init__(self):
+        self.start_frame_offset = FrameNumber(0)
+        self.time_scale = 1.0
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+
+class MovieSceneObjectBindingID(object):
+
+    def __init__(self, guid=None):
+        self.guid = guid or Guid('0' * 32)
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+
+class MovieSceneSkeletalAnimationParams(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneSkeletalAnimationParams, self).__init__(outer, name)
+        self.animation = None
+
+
+class MovieSceneSection(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneSection, self).__init__(outer, name)
+        self.start_frame = 0
+        self.end_frame = 0
+        self.completion_mode = MovieSceneCompletionMode.RESTORE_STATE
+        self.channels = list()
+
+    @_api('MovieSceneSection.get_start_frame')
+    def get_start_frame(self):
+        return self.start_frame
+
+    @_api('MovieSceneSection.get_end_frame')
+    def get_end_frame(self):
+        return self.end_frame
+
+    @_api('MovieSceneSection.set_start_frame')
+    def set_start_frame(self, start_frame):
+        self.start_frame = start_frame
+
+    @_api('MovieSceneSection.set_end_frame')
+    def set_end_frame(self, end_frame):
+        self.end_frame = end_frame
+
+    def set_completion_mode(self, mode):
+        self.completion_mode = mode
+
+    def get_all_channels(self):
+        return list(self.channels)
+
+
+class MovieSceneSubSection(MovieSceneSection):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneSubSection, self).__init__(outer, name)
+        self.sub_sequence = None
+        self.parameters = MovieSceneSectionParameters()
+
+    @_api('MovieSceneSubSection.set_sequence')
+    def set_sequence(self, sequence):
+        self.sub_sequence = sequence
+
+    def get_sequence(self):
+        return self.sub_sequence
+
+
+class MovieSceneCinematicShotSection(MovieSceneSubSection):
+    pass
+
+
+class MovieSceneCameraCutSection(MovieSceneSection):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneCameraCutSection, self).__init__(outer, name)
+        self.camera_binding_id = MovieSceneObjectBindingID()
+
+    def set_camera_binding_id(self, binding_id):
+        self.camera_binding_id = binding_id
+
+    def get_camera_binding_id(self):
+        return self.camera_binding_id
+
+
+class MovieSceneSkeletalAnimationSection(MovieSceneSection):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneSkeletalAnimationSection, self).__init__(outer, name)
+        self.params = MovieSceneSkeletalAnimationParams()
+
+
+class MovieSceneFloatSection(MovieSceneSection):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneFloatSection, self).__init__(outer, name)
+        self.channels = [MovieSceneScriptingFloatChannel(self, 'Value')]
+
+
+class MovieScene3DTransformSection(MovieSceneSection):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieScene3DTransformSection, self).__init__(outer, name)
+        self.channels = [
+            MovieSceneScriptingDoubleChannel(
+                self, '{}.{}'.format(group, axis))
+            for group in ('Location', 'Rotation', 'Scale')
+            for axis in 'XYZ'
+        ]
+
+
+class MovieSceneTrack(Object):
+    section_class = MovieSceneSection
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneTrack, self).__init__(outer, name)
+        self.sections = list()
+        self.display_name = ''
+
+    @_api('MovieSceneTrack.add_section')
+    def add_section(self):
+        u_section = self.section_class(
+            self, '{}_{}'.format(self.section_class.__name__,
+                                 len(self.sections)))
+        self.sections.append(u_section)
+        return u_section
+
+    @_api('MovieSceneTrack.get_sections')
+    def get_sections(self):
+        return list(self.sections)
+
+    @_api('MovieSceneTrack.remove_section')
+    def remove_section(self, section):
+        self.sections.remove(section)
+
+
+class MovieSceneSubTrack(MovieSceneTrack):
+    section_class = MovieSceneSubSection
+
+
+class MovieSceneCinematicShotTrack(MovieSceneSubTrack):
+    section_class = MovieSceneCinematicShotSection
+
+
+class MovieSceneCameraCutTrack(MovieSceneTrack):
+    section_class = MovieSceneCameraCutSection
+
+
+class MovieSceneSkeletalAnimationTrack(MovieSceneTrack):
+    section_class = MovieSceneSkeletalAnimationSection
+
+
+class MovieSceneFloatTrack(MovieSceneTrack):
+    section_class = MovieSceneFloatSection
+
+
+class MovieScene3DTransformTrack(MovieSceneTrack):
+    section_class = MovieScene3DTransformSection
+
+
+class MovieSceneAudioTrack(MovieSceneTrack):
+    pass
+
+
+class MovieSceneMediaTrack(MovieSceneTrack):
+    pass
+
+
+class SequencerBindingProxy(Object):
+
+    def __init__(self, sequence, bound_object):
+        super(SequencerBindingProxy, self).__init__(
+            sequence, bound_object.get_name())
+        self.sequence = sequence
+        self.bound_object = bound_object
+        self.guid = Guid()
+        self.tracks = list()
+
+    def __eq__(self, other):
+        return isinstance(other, SequencerBindingProxy) and \
+            self.guid == other.guid
+
+    def __hash__(self):
+        return hash(self.guid)
+
+    def get_id(self):
+        return self.guid
+
+    def get_display_name(self):
+        return self.bound_object.get_name()
+
+    def get_binding_id(self):
+        return MovieSceneObjectBindingID(self.guid)
+
+    @_api('SequencerBindingProxy.get_tracks')
+    def get_tracks(self):
+        return list(self.tracks)
+
+    @_api('SequencerBindingProxy.add_track')
+    def add_track(self, track_type):
+        u_track = track_type(self.sequence)
+        self.tracks.append(u_track)
+        return u_track
+
+    def find_tracks_by_type(self, track_type):
+        return [t for t in self.tracks if isinstance(t, track_type)]
+
+    @_api('SequencerBindingProxy.remove_track')
+    def remove_track(self, track):
+        self.tracks.remove(track)
+
+    @_api('SequencerBindingProxy.remove')
+    def remove(self):
+        self.sequence.bindings.remove(self)
+
+
+class MovieSceneSequence(_Asset):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneSequence, self).__init__(outer, name)
+        self.tracks = list()
+        self.bindings = list()
+        self.display_rate = FrameRate(30, 1)
+        self.tick_resolution = FrameRate(24000, 1)
+        self.playback_start = 0
+        self.playback_end = 150
+        self.view_range = (0.0, 5.0)
+
+    @_api('MovieSceneSequence.add_master_track')
+    def add_master_track(self, track_type):
+        u_track = track_type(self, '{}_{}'.format(
+            track_type.__name__, len(self.tracks)))
+        self.tracks.append(u_track)
+        return u_track
+
+    @_api('MovieSceneSequence.get_master_tracks')
+    def get_master_tracks(self):
+        return list(self.tracks)
+
+    @_api('MovieSceneSequence.find_master_tracks_by_type')
+    def find_master_tracks_by_type(self, track_type):
+        return [t for t in self.tracks if isinstance(t, track_type)]
+
+    @_api('MovieSceneSequence.remove_master_track')
+    def remove_master_track(self, track):
+        self.tracks.remove(track)
+        return True
+
+    @_api('MovieSceneSequence.add_possessable')
+    def add_possessable(self, object_to_possess):
+        binding = SequencerBindingProxy(self, object_to_possess)
+        self.bindings.append(binding)
+        return binding
+
+    @_api('MovieSceneSequence.get_bindings')
+    def get_bindings(self):
+        return list(self.bindings)
+
+    def get_display_rate(self):
+        return self.display_rate
+
+    def set_display_rate(self, display_rate):
+        self.display_rate = display_rate
+
+    def get_tick_resolution(self):
+        return self.tick_resolution
+
+    def get_playback_start(self):
+        return self.playback_start
+
+    def get_playback_end(self):
+        return self.playback_end
+
+    def set_playback_start(self, start_frame):
+        self.playback_start = start_frame
+
+    def set_playback_end(self, end_frame):
+        self.playback_end = end_frame
+
+    def get_playback_range(self):
+        return SequencerScriptingRange(self.playback_start, self.playback_end)
+
+    def set_view_range_start(self, start_time_in_seconds):
+        self.view_range = (start_time_in_seconds, self.view_range[1])
+
+    def set_view_range_end(self, end_time_in_seconds):
+        self.view_range = (self.view_range[0], end_time_in_seconds)
+
+
+class LevelSequence(MovieSceneSequence):
+    pass
+
+
+class SequencerBoundObjects(object):
+
+    def __init__(self, binding_proxy, bound_objects):
+        self.binding_proxy = binding_proxy
+        self.bound_objects = bound_objects
+
+
+class MovieSceneUserImportFBXSettings(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(MovieSceneUserImportFBXSettings, self).__init__(outer, name)
+        self.create_cameras = True
+        self.force_front_x_axis = False
+        self.match_by_name_only = True
+        self.reduce_keys = True
+
+
+class SequencerTools(object):
+
+    @staticmethod
+    @_api('SequencerTools.get_bound_objects')
+    def get_bound_objects(world, sequence, bindings, range):
+        return [SequencerBoundObjects(b, [b.bound_object]) for b in bindings]
+
+    @staticmethod
+    @_api('SequencerTools.import_level_sequence_fbx')
+    def import_level_sequence_fbx(world, sequence, bindings, import_fbx_settings,
+                                  import_filename):
+        return True
+
+
+class LevelSequenceEditorBlueprintLibrary(object):
+
+    @staticmethod
+    @_api('LevelSequenceEditorBlueprintLibrary.refresh_current_level_sequence')
+    def refresh_current_level_sequence():
+        pass
+
+
+# ---------------------------------------------------------------------------
+# movie pipeline
+
+
+class MoviePipelineSetting(Object):
+    pass
+
+
+class MoviePipelineOutputSetting(MoviePipelineSetting):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineOutputSetting, self).__init__(outer, name)
+        self.output_directory = DirectoryPath('')
+        self.output_resolution = IntPoint(1920, 1080)
+        self.output_frame_rate = FrameRate(24, 1)
+        self.file_name_format = '{sequence_name}.{frame_number}'
+        self.zero_pad_frame_numbers = 4
+        self.flush_disk_writes_per_shot = False
+        self.use_custom_playback_range = False
+        self.custom_start_frame = 0
+        self.custom_end_frame = 0
+
+
+class MoviePipelineDeferredPassBase(MoviePipelineSetting):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineDeferredPassBase, self).__init__(outer, name)
+        self.disable_multisample_effects = False
+
+
+class MoviePipelineImageSequenceOutputBase(MoviePipelineSetting):
+    pass
+
+
+class MoviePipelineImageSequenceOutput_PNG(
+        MoviePipelineImageSequenceOutputBase):
+    pass
+
+
+class MoviePipelineImageSequenceOutput_JPG(
+        MoviePipelineImageSequenceOutputBase):
+    pass
+
+
+class MoviePipelineImageSequenceOutput_BMP(
+        MoviePipelineImageSequenceOutputBase):
+    pass
+
+
+class MoviePipelineImageSequenceOutput_EXR(
+        MoviePipelineImageSequenceOutputBase):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineImageSequenceOutput_EXR, self).__init__(outer, name)
+        self.compression = EXRCompressionFormat.PIZ
+
+
+class MoviePipelineMasterConfig(_Asset):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineMasterConfig, self).__init__(None, name)
+        self.settings = [MoviePipelineOutputSetting(self)]
+
+    @_api('MoviePipelineMasterConfig.find_setting_by_class')
+    def find_setting_by_class(self, setting_class):
+        for setting in self.settings:
+            if isinstance(setting, setting_class):
+                return setting
+        return None
+
+    @_api('MoviePipelineMasterConfig.find_or_add_setting_by_class')
+    def find_or_add_setting_by_class(self, setting_class):
+        setting = self.find_setting_by_class(setting_class)
+        if setting is None:
+            setting = setting_class(self)
+            self.settings.append(setting)
+        return setting
+
+    @_api('MoviePipelineMasterConfig.copy_from')
+    def copy_from(self, source):
+        self.settings = list()
+        for setting in source.settings:
+            copy = type(setting)(self)
+            copy.__dict__.update(
+                {k: v for k, v in setting.__dict__.items() if k != '_outer'})
+            self.settings.append(copy)
+
+    def initialize_transient_settings(self):
+        pass
+
+
+class MoviePipelineExecutorJob(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineExecutorJob, self).__init__(outer, name)
+        self.job_name = ''
+        self.map = SoftObjectPath()
+        self.sequence = SoftObjectPath()
+        self.configuration = MoviePipelineMasterConfig()
+
+    @_api('MoviePipelineExecutorJob.set_configuration')
+    def set_configuration(self, preset):
+        self.configuration = MoviePipelineMasterConfig()
+        self.configuration.copy_from(preset)
+
+    def get_configuration(self):
+        return self.configuration
+
+
+class MoviePipelineQueue(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineQueue, self).__init__(outer, name)
+        self.jobs = list()
+
+    @_api('MoviePipelineQueue.allocate_new_job')
+    def allocate_new_job(self, job_type):
+        job = job_type(self)
+        self.jobs.append(job)
+        return job
+
+    @_api('MoviePipelineQueue.delete_job')
+    def delete_job(self, job):
+        self.jobs.remove(job)
+
+    @_api('MoviePipelineQueue.delete_all_jobs')
+    def delete_all_jobs(self):
+        del self.jobs[:]
+
+    @_api('MoviePipelineQueue.get_jobs')
+    def get_jobs(self):
+        return list(self.jobs)
+
+
+class OnMoviePipelineExecutorErrored(_Delegate):
+    pass
+
+
+class OnMoviePipelineExecutorFinished(_Delegate):
+    pass
+
+
+class OnMoviePipelineIndividualJobFinished(_Delegate):
+    pass
+
+
+class OnMoviePipelineIndividualShotFinished(_Delegate):
+    pass
+
+
+class MoviePipelineExecutorShot(Object):
+
+    def __init__(self, outer_name='', inner_name=''):
+        super(MoviePipelineExecutorShot, self).__init__()
+        self.outer_name = outer_name
+        self.inner_name = inner_name
+
+
+class MoviePipelineShotOutputData(object):
+
+    def __init__(self, shot):
+        self.shot = shot
+
+
+class MoviePipelineOutputData(object):
+
+    def __init__(self, job, success, shot_data=()):
+        self.job = job
+        self.success = success
+        self.shot_data = list(shot_data)
+
+
+class MoviePipeline(Object):
+
+    def __init__(self, job):
+        super(MoviePipeline, self).__init__()
+        self.job = job
+
+    def get_current_job(self):
+        return self.job
+
+
+# job names the executors fail on
+FAIL_JOBS = set()
+
+
+class MoviePipelineExecutorBase(Object):
+
+    def __init__(self, outer=None, name=None):
+        object.__setattr__(self, 'on_executor_errored_delegate',
+                           OnMoviePipelineExecutorErrored())
+        object.__setattr__(self, 'on_executor_finished_delegate',
+                           OnMoviePipelineExecutorFinished())
+        super(MoviePipelineExecutorBase, self).__init__(outer, name)
+
+    def __setattr__(self, name, value):
+        # delegate properties are copied on assignment like in the engine
+        if isinstance(value, _Delegate):
+            value = value.copy()
+        object.__setattr__(self, name, value)
+
+    def execute(self, queue):
+        success = True
+        for job in queue.get_jobs():
+            CALLS['MoviePipeline.render_job'] += 1
+            latency = LATENCIES.get('MoviePipeline.render_job',
+                                    DEFAULT_LATENCY)
+            if latency:
+                time.sleep(latency)
+
+            if job.job_name in FAIL_JOBS:
+                success = False
+                self.on_executor_errored_delegate.broadcast(
+                    self, MoviePipeline(job), False, 'Fake failure')
+                self.job_finished(job, False)
+                continue
+
+            shot = MoviePipelineExecutorShot(
+                job.sequence.export_text(), job.job_name)
+            self.shot_finished(MoviePipelineOutputData(
+                job, True, [MoviePipelineShotOutputData(shot)]))
+            self.job_finished(job, True)
+
+        self.on_executor_finished_delegate.broadcast(self, success)
+
+    def job_finished(self, job, success):
+        pass
+
+    def shot_finished(self, output_data):
+        pass
+
+
+class MoviePipelinePIEExecutor(MoviePipelineExecutorBase):
+    """
+    Per job and shot delegates are only declared on the PIE executor
+    """
+
+    def __init__(self, outer=None, name=None):
+        object.__setattr__(self, 'on_individual_job_finished_delegate',
+                           OnMoviePipelineIndividualJobFinished())
+        object.__setattr__(self, 'on_individual_shot_work_finished_delegate',
+                           OnMoviePipelineIndividualShotFinished())
+        super(MoviePipelinePIEExecutor, self).__init__(outer, name)
+
+    def job_finished(self, job, success):
+        self.on_individual_job_finished_delegate.broadcast(job, success)
+
+    def shot_finished(self, output_data):
+        self.on_individual_shot_work_finished_delegate.broadcast(output_data)
+
+
+class MoviePipelineNewProcessExecutor(MoviePipelineExecutorBase):
+    pass
+
+
+class MoviePipelineQueueSubsystem(Object):
+
+    def __init__(self, outer=None, name=None):
+        super(MoviePipelineQueueSubsystem, self).__init__(outer, name)
+        self.queue = MoviePipelineQueue(self)
+
+    def get_queue(self):
+        return self.queue
+
+    @_api('MoviePipelineQueueSubsystem.render_queue_with_executor_instance')
+    def render_queue_with_executor_instance(self, executor):
+        executor.execute(self.queue)
+        return executor
+
+
+_SUBSYSTEMS = dict()
+
+
+def get_editor_subsystem(subsystem_class):
+    if subsystem_class not in _SUBSYSTEMS:
+        _SUBSYSTEMS[subsystem_class] = subsystem_class()
+    return _SUBSYSTEMS[subsystem_class]
+
+
+# ---------------------------------------------------------------------------
+# tool menus
+
+
+class ToolMenuEntry(object):
+
+    def __init__(self, name='', owner=None, type=MultiBlockType.MENU_ENTRY):
+        self.name = name
+        self.type = type
+        self.label = ''
+        self.command = None
+
+    def set_label(self, label):
+        self.label = label
+
+    def set_string_command(self, type, custom_type, string):
+        self.command = (type, string)
+
+
+# registered menus in registration order, found as RegisteredMenu_<index>
+REGISTERED_MENUS = list()
+
+
+class ToolMenu(Object):
+
+    def __init__(self, menu_name, label=''):
+        super(ToolMenu, self).__init__(None, menu_name)
+        self.menu_name = Name(menu_name)
+        self.label = label
+        self.sections = list()
+        self.entries = list()
+        self.sub_menus = list()
+
+    @_api('ToolMenu.add_sub_menu')
+    def add_sub_menu(self, owner, section_name, name, label, tool_tip=''):
+        sub_menu = ToolMenus.get().register_menu(
+            '{}.{}'.format(self.menu_name, name), label)
+        self.sub_menus.append((section_name, sub_menu))
+        return sub_menu
+
+    @_api('ToolMenu.add_section')
+    def add_section(self, section_name, label='', insert_name='',
+                    insert_type=None):
+        self.sections.append(section_name)
+
+    @_api('ToolMenu.add_menu_entry')
+    def add_menu_entry(self, section_name, args):
+        self.entries.append((section_name, args))
+
+
+class ToolMenus(Object):
+    _instance = None
+
+    def __init__(self):
+        super(ToolMenus, self).__init__(None, 'ToolMenus_0')
+        self.menus = dict()
+        self.refresh_count = 0
+        self.register_menu('LevelEditor.MainMenu')
+
+    @classmethod
+    def get(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def register_menu(self, name, label='', parent='', type=None):
+        menu = self.menus.get(name)
+        if menu is None:
+            menu = ToolMenu(name, label)
+            self.menus[name] = menu
+            REGISTERED_MENUS.append(menu)
+        return menu
+
+    @_api('ToolMenus.find_menu')
+    def find_menu(self, name):
+        return self.menus.get(str(name))
+
+    @_api('ToolMenus.refresh_all_widgets')
+    def refresh_all_widgets(self):
+        self.refresh_count += 1
+
+
+@_api('find_object')
+def find_object(outer, name):
+    match = re.search(r'RegisteredMenu_(\d+)$', name)
+    if match:
+        index = int(match.group(1))
+        if index < len(REGISTERED_MENUS):
+            return REGISTERED_MENUS[index]
+        return None
+    return ASSETS.get(_package(name))
+
+
+@_api('load_asset')
+def load_asset(name):
+    return ASSETS.get(_package(name))
+
+
+# ---------------------------------------------------------------------------
+
+
+def reset():
+    """
+    Clear every registry, counter and latency
+    """
+    LATENCIES.clear()
+    CALLS.clear()
+    ASSETS.clear()
+    DEPENDENCIES.clear()
+    DIRECTORIES.clear()
+    SELECTION[:] = []
+    ACTORS[:] = []
+    TRANSACTIONS[:] = []
+    FAIL_JOBS.clear()
+    REGISTERED_MENUS[:] = []
+    _SUBSYSTEMS.clear()
+    ToolMenus._instance = None
@@ -1,24 +1,40 @@
 import os
+import time
 
 import unreal
 
+import registry
 
-def import_binding_cam_fbx(fbx, u_binding):
+
+def get_cam_import_settings():
     """
-    Import .fbx animation on camera binding track
+    Import settings of camera animation on bindings
 
-    :param fbx: str. camera .fbx path
-    :param u_binding: unreal.SequencerBindingProxy
+    :return: unreal.MovieSceneUserImportFBXSettings
     """
     settings = unreal.MovieSceneUserImportFBXSettings()
     settings.set_editor_property('create_cameras', False)
     settings.set_editor_property('force_front_x_axis', False)
     settings.set_editor_property('match_by_name_only', False)
     settings.set_editor_property('reduce_keys', False)
+    return settings
+
+
+def import_binding_cam_fbx(fbx, u_binding, settings=None):
+    """
+    Import .fbx animation on camera binding track
+
+    :param fbx: str. camera .fbx path
+    :param u_binding: unreal.SequencerBindingProxy
+    :param settings: unreal.MovieSceneUserImportFBXSettings. (Optional)
+                     shared import settings
+    :return: bool. whether the import is successful
+    """
+    settings = settings or get_cam_import_settings()
 
     u_seq = u_binding.get_editor_property('sequence')
     u_world = unreal.EditorLevelLibrary.get_editor_world()
-    unreal.SequencerTools.import_level_sequence_fbx(
+    return unreal.SequencerTools.import_level_sequence_fbx(
         u_world,
         u_seq,
         [u_binding],
@@ -27,6 +43,70 @@ def import_binding_cam_fbx(fbx, u_binding):
     )
 
 
+def import_binding_cam_fbxs(pairs, settings=None, group=False):
+    """
+    Import .fbx animations on many camera bindings with shared settings and
+    a single sequencer refresh
+
+    :param pairs: [(str, unreal.SequencerBindingProxy)]. camera .fbx path and
+                  the binding to import on
+    :param settings: unreal.MovieSceneUserImportFBXSettings. (Optional)
+                     shared import settings
+    :param group: bool. import bindings of the same sequence sharing an .fbx
+                  in a single call, the .fbx then needs one camera named
+                  after each binding and settings matching by name only
+    :return: [dict]. per (fbx, binding) pair in submission order, 'fbx',
+             'binding' name, 'success', 'error' and 'time' in seconds, the
+             time of a grouped call is split evenly between its bindings
+    """
+    settings = settings or get_cam_import_settings()
+    if group and not settings.get_editor_property('match_by_name_only'):
+        raise ValueError(
+            'Grouped imports need match_by_name_only, cameras would be '
+            'assigned to bindings arbitrarily')
+    u_world = unreal.EditorLevelLibrary.get_editor_world()
+
+    # group by (sequence, fbx) keeping the submission order
+    groups = dict()
+    for i, (fbx, u_binding) in enumerate(pairs):
+        u_seq = u_binding.get_editor_property('sequence')
+        key = (u_seq.get_path_name(), os.path.normpath(fbx))
+        if not group:
+            key += (i,)
+        groups.setdefault(key, (u_seq, fbx, []))[2].append((i, u_binding))
+
+    results = [None] * len(pairs)
+    for u_seq, fbx, members in groups.values():
+        u_bindings = [u_binding for _, u_binding in members]
+        error = None
+        start = time.time()
+        try:
+            success = unreal.SequencerTools.import_level_sequence_fbx(
+                u_world,
+                u_seq,
+                u_bindings,
+                settings,
+                fbx
+            )
+        except Exception as e:
+            unreal.log_error('Failed to import {}: {}'.format(fbx, e))
+            success = False
+            error = str(e)
+        duration = (time.time() - start) / len(members)
+
+        for i, u_binding in members:
+            results[i] = {
+                'fbx': fbx,
+                'binding': u_binding.get_display_name(),
+                'success': bool(success),
+                'error': error,
+                'time': duration,
+            }
+
+    unreal.LevelSequenceEditorBlueprintLibrary.refresh_current_level_sequence()
+    return results
+
+
 def reimport_fbx(u_asset):
     """
     Re-import Unreal uasset with same import options
@@ -46,6 +126,7 @@ def reimport_fbx(u_asset):
     task.set_editor_property('save', True)
 
     unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
+    registry.clear_cache(u_asset.get_path_name())
 
     return u_asset
 
@@ -84,6 +165,7 @@ def import_skm_fbx(fbx_file, u_folder, name):
     task.set_editor_property('save', True)
 
     unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
+    registry.clear_cache('{}/{}'.format(u_folder.rstrip('/'), name))
 
 
 def import_anim_fbx(fbx_file, u_skeleton, u_folder, name):
@@ -120,3 +202,4 @@ def import_anim_fbx(fbx_file, u_skeleton, u_folder, name):
     task.set_editor_property('save', True)
 
     unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
+    registry.clear_cache('{}/{}'.format(u_folder.rstrip('/'), name))
@@ -0,0 +1,113 @@
+"""
+Dependency size rollup
+
+Sum the on-disk size of everything loading an asset pulls in: the transitive
+dependency closure of one or many roots, each shared package counted once.
+"""
+
+import os
+
+import path
+
+
+class Footprint(object):
+    """
+    Dependency closure sizes served from shared caches, so many roots over
+    the same project only query the registry and the disk once per package
+    """
+
+    def __init__(self, u_registry, u_options, graph=None, filter_code=True):
+        """
+        :param u_registry: unreal.AssetRegistry
+        :param u_options: unreal.AssetRegistryDependencyOption
+        :param graph: reference.PackageGraph. (Optional) prebuilt graph to
+                      read dependencies from instead of the registry
+        :param filter_code: bool. whether to filter out engine builtin script
+                            or functions etc
+        """
+        self.u_registry = u_registry
+        self.u_options = u_options
+        self.filter_code = filter_code
+        self.dependencies = dict(graph.dependencies) if graph else dict()
+        self.sizes = dict()
+        self.closures = dict()
+
+    def get_dependencies(self, package):
+        """
+        :param package: str. unreal asset package name
+        :return: set(str). direct dependency packages
+        """
+        if package not in self.dependencies:
+            dependencies = self.u_registry.get_dependencies(
+                package_name=package,
+                dependency_options=self.u_options
+            ) or []
+            dependencies = set(str(dep) for dep in dependencies)
+            if self.filter_code:
+                dependencies = set(dep for dep in dependencies
+                                   if dep.startswith('/Game'))
+            dependencies.discard(package)
+            self.dependencies[package] = dependencies
+        return self.dependencies[package]
+
+    def get_size(self, package):
+        """
+        :param package: str. unreal asset package name
+        :return: int. bytes of the package file, 0 if not found on disk
+        """
+        if package not in self.sizes:
+            name = package.rsplit('/', 1)[-1]
+            asset_file = path.to_sys_path('{}.{}'.format(package, name))
+            size = 0
+            for sys_path in (asset_file,
+                             os.path.splitext(asset_file)[0] + '.umap'):
+                if os.path.isfile(sys_path):
+                    size = os.path.getsize(sys_path)
+                    break
+            self.sizes[package] = size
+        return self.sizes[package]
+
+    def get_closure(self, root):
+        """
+        :param root: str. unreal asset package name
+        :return: frozenset(str). the root and all its transitive dependencies
+        """
+        if root not in self.closures:
+            seen = set()
+            stack = [root]
+            while stack:
+                package = stack.pop()
+                if package in seen:
+                    continue
+                # reuse closures computed for other roots
+                if package in self.closures and package != root:
+                    seen |= self.closures[package]
+                    continue
+                seen.add(package)
+                stack.extend(self.get_dependencies(package))
+            self.closures[root] = frozenset(seen)
+        return self.closures[root]
+
+    def rollup(self, roots, top=10):
+        """
+        Total size of loading one or many roots
+
+        :param roots: str or [str]. unreal asset package names
+        :param top: int. number of biggest contributors to report
+        :return: dict. 'packages' count, total 'bytes' and 'top'
+                 [(package, bytes)] biggest first
+        """
+        if isinstance(roots, str):
+            roots = [roots]
+
+        packages = set()
+        for root in roots:
+            packages |= self.get_closure(root)
+
+        sizes = [(package, self.get_size(package)) for package in packages]
+        sizes.sort(key=lambda item: item[1], reverse=True)
+        return {
+            'packages': len(packages),
+            'bytes': sum(size for _, size in sizes),
+            'top': sizes[:top],
+        }
@@ -17,12 +17,48 @@ Note:
 """
 
 
+import importlib
+import sys
+import time
+from contextlib import contextmanager
 from functools import wraps
 
 
 import unreal
 
 
+# refresh deferral depth and whether a refresh was requested meanwhile
+_DEFER = {'depth': 0, 'pending': False}
+
+
+def refresh_all():
+    """
+    Refresh all menu widgets, or only flag it while refreshes are deferred
+    """
+    if _DEFER['depth']:
+        _DEFER['pending'] = True
+        return
+
+    menus = unreal.ToolMenus.get()
+    menus.refresh_all_widgets()
+
+
+@contextmanager
+def deferred_refresh():
+    """
+    Collapse the refreshes of everything within the scope, e.g. functions
+    decorated by `refresh_menus`, into a single refresh at the end
+    """
+    _DEFER['depth'] += 1
+    try:
+        yield
+    finally:
+        _DEFER['depth'] -= 1
+        if not _DEFER['depth'] and _DEFER['pending']:
+            _DEFER['pending'] = False
+            refresh_all()
+
+
 def refresh_menus(func):
     """
     Force a post-refresh on Unreal main menu bar
@@ -34,8 +70,7 @@ def refresh_menus(func):
         except Exception:
             raise
         finally:
-            menus = unreal.ToolMenus.get()
-            menus.refresh_all_widgets()
+            refresh_all()
 
     return refresh
 
@@ -72,6 +107,7 @@ def create_menu(parent_menu, menu_name, section_name=''):
         name=menu_name,
         label=menu_name
     )
+    REGISTRY.stale = True
     return sub_menu
 
 
@@ -129,26 +165,291 @@ def create_tool_button(parent_menu, entry_name, command, section_name=''):
     return entry
 
 
-def list_menu(num=1000):
+class LazyCommand(object):
     """
-    Query all menu object name
+    Menu command importing its target on first click only
+    """
+
+    def __init__(self, module_path, func_name):
+        """
+        :param module_path: str. python module path, e.g. 'tools.render'
+        :param func_name: str. name of the callable in the module
+        """
+        self.module_path = module_path
+        self.func_name = func_name
+        self.func = None
+        self.import_time = None
+        self.was_imported = None
+
+    @property
+    def key(self):
+        return '{}:{}'.format(self.module_path, self.func_name)
+
+    def load(self):
+        """
+        Import and cache the target callable
+
+        :return: callable.
+        """
+        if self.func is None:
+            self.was_imported = self.module_path in sys.modules
+            start = time.time()
+            module = importlib.import_module(self.module_path)
+            self.func = getattr(module, self.func_name)
+            self.import_time = time.time() - start
+        return self.func
+
+    def __call__(self):
+        return self.load()()
+
+
+# "module:func": LazyCommand
+LAZY_COMMANDS = dict()
+
+
+def get_command(module_path, func_name):
+    """
+    Get the lazy command of a callable, created on first request
+
+    :param module_path: str. python module path of the command
+    :param func_name: str. name of the callable in the module
+    :return: LazyCommand.
+    """
+    command = LazyCommand(module_path, func_name)
+    return LAZY_COMMANDS.setdefault(command.key, command)
+
+
+def run_command(module_path, func_name):
+    """
+    Run a lazy command, this is what lazy menu entries execute. The entry
+    string holds the whole command so it keeps working after this module
+    is reloaded
+
+    :param module_path: str. python module path of the command
+    :param func_name: str. name of the callable in the module
+    """
+    return get_command(module_path, func_name)()
+
+
+def create_lazy_entry(
+        parent_menu,
+        entry_name,
+        module_path,
+        func_name,
+        section_name='',
+        tool_button=False
+):
+    """
+    Create a menu entry or tool bar button that only imports its command
+    module when clicked
+
+    :param parent_menu: unreal.ToolMenu. menu to be created in
+    :param entry_name: str. menu entry name
+    :param module_path: str. python module path of the command
+    :param func_name: str. name of the callable to run in the module
+    :param section_name: str. (Optional) name of the menu section
+    :param tool_button: bool. create a tool bar button instead of an entry
+    :return: unreal.ToolMenuEntry
+    """
+    get_command(module_path, func_name)
+
+    string = 'import {0}; {0}.run_command({1!r}, {2!r})'.format(
+        __name__, module_path, func_name)
+    if tool_button:
+        return create_tool_button(parent_menu, entry_name, string, section_name)
+    return create_menu_entry(parent_menu, entry_name, string, section_name)
+
+
+def get_import_report(load=False):
+    """
+    Import cost of each lazy command, the startup time it would cost if it
+    was imported eagerly
+
+    :param load: bool. import commands not clicked yet to measure them
+    :return: [dict]. 'command', 'import_time' in seconds (None if not
+             loaded) and 'cached' when the module was already imported by
+             something else, most expensive first
+    """
+    report = list()
+    for command in LAZY_COMMANDS.values():
+        if load:
+            command.load()
+        report.append({
+            'command': command.key,
+            'import_time': command.import_time,
+            'cached': command.was_imported,
+        })
+    return sorted(report, key=lambda r: r['import_time'] or 0, reverse=True)
+
+
+class MenuRegistry(object):
+    """
+    Cache of registered menu names and objects
+
+    Registered menus are transient objects named 'RegisteredMenu_<index>',
+    indices only grow, so the registry probes them in order, stops at the
+    first long run of misses and resumes from the last hit on refresh.
 
     https://blog.l0v0.com/posts/cad78e0d.html
+    """
+
+    def __init__(self, max_misses=32):
+        """
+        :param max_misses: int. consecutive misses ending a probe
+        """
+        self.max_misses = max_misses
+        self.menus = dict()
+        # menu name: RegisteredMenu index
+        self.indices = dict()
+        self.next_index = 0
+        self.stale = True
+        self.lookups = 0
+
+    def refresh(self, num=1000):
+        """
+        Probe menus registered since the last refresh, by this module or any
+        other tool, a refresh without new menus costs max_misses lookups
+
+        :param num: int. menu object max index
+        """
+        misses = 0
+        index = self.next_index
+        while index < num and misses < self.max_misses:
+            obj = unreal.find_object(
+                None,
+                "/Engine/Transient.ToolMenus_0:RegisteredMenu_%s" % index
+            )
+            self.lookups += 1
+            index += 1
+            if not obj:
+                misses += 1
+                continue
+
+            misses = 0
+            self.next_index = index
+            menu_name = str(obj.menu_name)
+            if menu_name != "None":
+                self.menus[menu_name] = obj
+                self.indices[menu_name] = index - 1
+
+        self.stale = False
+
+    def clear(self):
+        self.menus.clear()
+        self.indices.clear()
+        self.next_index = 0
+        self.stale = True
+
+    def get_names(self, num=1000):
+        """
+        :param num: int. menu object max index
+        :return: [str]. registered menu object names
+        """
+        self.refresh(num)
+        return [name for name in self.menus if self.indices[name] < num]
+
+    def get(self, menu_name):
+        """
+        :param menu_name: str. menu object name
+        :return: unreal.ToolMenu.
+        """
+        if self.stale or menu_name not in self.menus:
+            self.refresh()
+        return self.menus.get(menu_name)
+
+    def search(self, keyword):
+        """
+        :param keyword: str. case insensitive part of the menu name
+        :return: [str]. matching menu object names
+        """
+        keyword = keyword.lower()
+        return [name for name in self.get_names() if keyword in name.lower()]
+
+
+REGISTRY = MenuRegistry()
+
+
+def list_menu(num=1000):
+    """
+    Query all menu object name
 
     :param num: int. menu object max count
     :return: [str]. list of menu object names
     """
-    menu_list = set()
-    for i in range(num):
-        obj = unreal.find_object(
-            None,
-            "/Engine/Transient.ToolMenus_0:RegisteredMenu_%s" % i
-        )
-        if not obj:
-            continue
+    return REGISTRY.get_names(num)
 
-        menu_name = str(obj.menu_name)
-        if menu_name != "None":
-            menu_list.add(menu_name)
 
-    return list(menu_list)
+def _build_items(parent_menu, items, created, parents=(), section_name=''):
+    """
+    :return: int. number of items built, sections included
+    """
+    count = 0
+    for item in items:
+        typ = item['type']
+        name = item['name']
+        section = item.get('section', section_name)
+        # labels repeat across submenus, the path in the tree does not
+        path = parents + (name,)
+        count += 1
+
+        if typ == 'section':
+            create_menu_section(parent_menu, name)
+            # children default to the section they are declared in
+            count += _build_items(
+                parent_menu, item.get('children', []), created, path, name)
+        elif typ == 'menu':
+            sub_menu = create_menu(parent_menu, name, section)
+            created[path] = sub_menu
+            count += _build_items(
+                sub_menu, item.get('children', []), created, path)
+        elif typ == 'entry':
+            created[path] = create_menu_entry(
+                parent_menu, name, item['command'], section)
+        elif typ == 'button':
+            created[path] = create_tool_button(
+                parent_menu, name, item['command'], section)
+        else:
+            raise ValueError('Unknown menu item type {}'.format(typ))
+    return count
+
+
+def build_menu_tree(parent_menu, items):
+    """
+    Build a declarative menu tree in one pass with a single widget refresh
+
+    Example:
+        build_menu_tree(get_menu_bar(), [
+            {'type': 'menu', 'name': 'Studio', 'children': [
+                {'type': 'section', 'name': 'Render', 'children': [
+                    {'type': 'entry', 'name': 'Render Shots',
+                     'command': 'import render_tool; render_tool.run()'},
+                ]},
+            ]},
+        ])
+
+    :param parent_menu: unreal.ToolMenu. menu to build the tree in
+    :param items: [dict]. item dicts with 'type' ('menu', 'section', 'entry'
+                  or 'button'), 'name', an optional 'section' name,
+                  'command' for entries/buttons and 'children' for menus and
+                  sections
+    :return: ({(str,): object}, dict). created menus/entries by their path
+             of item names in the tree, e.g. ('Studio', 'Render',
+             'Render Shots'), and the build timings with the 'items' count
+    """
+    created = dict()
+    start = time.time()
+    with deferred_refresh():
+        count = _build_items(parent_menu, items, created)
+        build_end = time.time()
+        refresh_all()
+    end = time.time()
+
+    timings = {
+        'items': count,
+        'build': build_end - start,
+        'refresh': end - build_end,
+        'total': end - start,
+    }
+    unreal.log('Built {} menu items in {:.3f}s'.format(
+        count, timings['total']))
+    return created, timings
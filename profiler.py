@@ -0,0 +1,285 @@
+"""
+Opt-in engine call instrumentation
+
+When enabled, the `unreal` module referenced by the library modules is
+swapped for a proxy counting and timing `unreal.*` calls: module functions
+and the static functions of library classes (EditorAssetLibrary,
+AssetToolsHelpers, SequencerTools, ToolMenus...). The methods of the engine
+classes listed in ENGINE_CLASSES (asset registry, sequences, tracks,
+sections, movie pipeline queue...) are patched in place, so calls on the
+objects the engine hands out are timed too, including from modules such as
+`reference` that only receive them as arguments, while identity and type
+checks keep working. Together this tells time spent in the engine apart
+from time spent in our python. Disabled, the modules hold the real `unreal`
+module and the original methods are restored.
+
+Example:
+    profiler.enable()
+    editor.get_assets_from_folder('/Game/Shots')
+    print(profiler.report())
+    profiler.disable()
+"""
+
+import cProfile
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+
+LIBRARY_MODULES = (
+    'editor',
+    'fbx',
+    'footprint',
+    'menu',
+    'path',
+    'reference',
+    'registry',
+    'cinematic.channel',
+    'cinematic.conform',
+    'cinematic.frametime',
+    'cinematic.hierarchy',
+    'cinematic.preset',
+    'cinematic.section',
+    'cinematic.sequence',
+    'cinematic.track',
+    'render.render',
+)
+
+# max durations kept per function for percentiles
+RESERVOIR_SIZE = 1000
+
+# classes holding static engine functions, proxied to time their calls
+STATIC_CLASS_SUFFIXES = ('Library', 'Helpers', 'Tools', 'ToolMenus')
+
+# engine classes whose instance methods are timed, subclasses inherit them
+ENGINE_CLASSES = (
+    'AssetRegistry',
+    'AssetTools',
+    'MovieSceneSequence',
+    'MovieSceneTrack',
+    'MovieSceneSection',
+    'MovieSceneScriptingChannel',
+    'MovieSceneScriptingFloatChannel',
+    'MovieSceneScriptingDoubleChannel',
+    'SequencerBindingProxy',
+    'MoviePipelineQueue',
+    'MoviePipelineExecutorJob',
+    'MoviePipelineMasterConfig',
+    'MoviePipelineQueueSubsystem',
+    'ToolMenu',
+)
+
+_PACKAGE = __name__.rpartition('.')[0]
+_STATE = {'sample_every': 1, 'patched': dict(), 'methods': list()}
+
+
+class CallStats(object):
+    __slots__ = ('count', 'timed', 'total', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.timed = 0
+        self.total = 0.0
+        self.samples = list()
+
+    def add(self, duration):
+        self.timed += 1
+        self.total += duration
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(duration)
+        else:
+            index = random.randrange(self.timed)
+            if index < RESERVOIR_SIZE:
+                self.samples[index] = duration
+
+    def percentile(self, percent):
+        if not self.samples:
+            return None
+        samples = sorted(self.samples)
+        return samples[int(round((len(samples) - 1) * percent / 100.0))]
+
+
+# function name: CallStats
+STATS = dict()
+
+
+def _timed(func, name):
+    def wrapper(*args, **kwargs):
+        stats = STATS.get(name)
+        if stats is None:
+            stats = STATS[name] = CallStats()
+        stats.count += 1
+        if stats.count % _STATE['sample_every']:
+            return func(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.add(time.perf_counter() - start)
+
+    wrapper.__name__ = getattr(func, '__name__', name)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+class Proxy(object):
+    """
+    Attribute proxy timing the callables it hands out
+    """
+
+    def __init__(self, obj, name):
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_name', name)
+
+    def __getattr__(self, attr):
+        value = getattr(self._obj, attr)
+        name = '{}.{}'.format(self._name, attr)
+        if isinstance(value, type):
+            if attr.endswith(STATIC_CLASS_SUFFIXES):
+                return Proxy(value, name)
+            return value
+        if callable(value):
+            return _timed(value, name)
+        return value
+
+    def __setattr__(self, attr, value):
+        setattr(self._obj, attr, value)
+
+    def __call__(self, *args, **kwargs):
+        return _timed(self._obj, self._name)(*args, **kwargs)
+
+    def __repr__(self):
+        return '<Proxy {!r}>'.format(self._obj)
+
+
+def wrap(obj, name=None):
+    """
+    Time the method calls of an engine object, e.g. an asset registry
+
+    :param obj: object. object to instrument
+    :param name: str. (Optional) prefix of the recorded function names
+    :return: Proxy.
+    """
+    return Proxy(obj, name or type(obj).__name__)
+
+
+def is_enabled():
+    return bool(_STATE['patched'] or _STATE['methods'])
+
+
+def _patch_methods(u_module, class_names):
+    for class_name in class_names:
+        cls = getattr(u_module, class_name, None)
+        if not isinstance(cls, type):
+            continue
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or isinstance(
+                    value, (type, staticmethod, classmethod, property)):
+                continue
+            if not callable(value):
+                continue
+            try:
+                setattr(cls, attr,
+                        _timed(value, '{}.{}'.format(class_name, attr)))
+            except (AttributeError, TypeError):
+                # immutable type
+                break
+            _STATE['methods'].append((cls, attr, value))
+
+
+def enable(modules=LIBRARY_MODULES, sample_every=1,
+           class_names=ENGINE_CLASSES):
+    """
+    Instrument the `unreal` calls of the already imported library modules
+    and the methods of engine classes
+
+    :param modules: [str]. library module names
+    :param sample_every: int. time one call out of N, every call is still
+                         counted
+    :param class_names: [str]. engine classes whose methods are timed
+    """
+    _STATE['sample_every'] = max(1, int(sample_every))
+    if not _STATE['methods']:
+        _patch_methods(sys.modules.get('unreal'), class_names)
+
+    for name in modules:
+        full_name = '.'.join(filter(None, [_PACKAGE, name]))
+        module = sys.modules.get(full_name)
+        u_module = getattr(module, 'unreal', None)
+        if u_module is None or isinstance(u_module, Proxy):
+            continue
+        _STATE['patched'][full_name] = u_module
+        module.unreal = Proxy(u_module, 'unreal')
+
+
+def disable():
+    """
+    Restore the real `unreal` module in the instrumented modules
+    """
+    for full_name, u_module in _STATE['patched'].items():
+        sys.modules[full_name].unreal = u_module
+    _STATE['patched'].clear()
+
+    for cls, attr, value in reversed(_STATE['methods']):
+        setattr(cls, attr, value)
+    del _STATE['methods'][:]
+
+
+def reset():
+    STATS.clear()
+
+
+def get_stats():
+    """
+    :return: {str: dict}. per function 'count', 'timed', 'total', 'mean',
+             'p50' and 'p95' in seconds, timed totals only cover the
+             sampled calls
+    """
+    return {
+        name: {
+            'count': stats.count,
+            'timed': stats.timed,
+            'total': stats.total,
+            'mean': stats.total / stats.timed if stats.timed else None,
+            'p50': stats.percentile(50),
+            'p95': stats.percentile(95),
+        }
+        for name, stats in STATS.items()
+    }
+
+
+def report(top=20):
+    """
+    :param top: int. number of functions listed, by total time
+    :return: str. table of the most expensive engine calls
+    """
+    rows = sorted(get_stats().items(), key=lambda item: item[1]['total'],
+                  reverse=True)[:top]
+    lines = ['{:<60} {:>8} {:>10} {:>10} {:>10}'.format(
+        'function', 'count', 'total(s)', 'p50(ms)', 'p95(ms)')]
+    for name, stats in rows:
+        lines.append('{:<60} {:>8} {:>10.4f} {:>10.3f} {:>10.3f}'.format(
+            name, stats['count'], stats['total'],
+            (stats['p50'] or 0) * 1000, (stats['p95'] or 0) * 1000))
+    return '\n'.join(lines)
+
+
+@contextmanager
+def profiled(path=None):
+    """
+    Run the scope under cProfile
+
+    :param path: str. (Optional) file to dump the stats to, readable by
+                 pstats/snakeviz
+    :return: cProfile.Profile.
+    """
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        if path:
+            profile.dump_stats(path)
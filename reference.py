@@ -2,8 +2,13 @@
 Find Unreal asset's referencers or dependencies
 
 Similar backend behaviour compared to Unreal's reference viewer
+
+Pass `registry.get_registry()` as u_registry to share cached query results
+with the rest of the session.
 """
 
+import unreal
+
 
 def get_references_as_list(
         u_registry,
@@ -245,3 +250,215 @@ def get_dependencies(
                 duplicate_lookups.extend(dependencies)
 
     return storages
+
+
+def get_asset_class(asset_data):
+    """
+    Class name of an asset data across engine versions
+
+    :param asset_data: unreal.AssetData
+    :return: str. e.g. 'World'
+    """
+    class_path = getattr(asset_data, 'asset_class_path', None)
+    if class_path is not None:
+        return str(class_path.asset_name)
+    return str(asset_data.asset_class)
+
+
+class PackageGraph(object):
+    """
+    Package dependency graph of a content folder, built in one sweep over
+    the asset registry with a single dependency query per package
+    """
+
+    def __init__(self, root='/Game'):
+        # swept content folder
+        self.root = root.rstrip('/')
+        # package: set(dependency packages)
+        self.dependencies = dict()
+        # package: set(asset class names)
+        self.classes = dict()
+        self._referencers = None
+
+    @classmethod
+    def build(cls, u_registry, u_options, root='/Game', filter_code=True):
+        """
+        :param u_registry: unreal.AssetRegistry
+        :param u_options: unreal.AssetRegistryDependencyOption
+        :param root: str. content folder to sweep recursively
+        :param filter_code: bool. whether to filter out engine builtin script
+                            or functions etc
+        :return: PackageGraph.
+        """
+        graph = cls(root)
+        for asset_data in u_registry.get_assets_by_path(root, recursive=True):
+            package = str(asset_data.package_name)
+            graph.classes.setdefault(package, set()).add(
+                get_asset_class(asset_data))
+
+        for package in graph.classes:
+            dependencies = u_registry.get_dependencies(
+                package_name=package,
+                dependency_options=u_options
+            ) or []
+            dependencies = set(str(dep) for dep in dependencies)
+            if filter_code:
+                dependencies = set(dep for dep in dependencies
+                                   if dep.startswith('/Game'))
+            dependencies.discard(package)
+            graph.dependencies[package] = dependencies
+
+        return graph
+
+    @property
+    def packages(self):
+        return list(self.classes)
+
+    @property
+    def referencers(self):
+        """
+        :return: {str: set(str)}. reverse edges, computed once
+        """
+        if self._referencers is None:
+            self._referencers = {package: set() for package in self.classes}
+            for package, dependencies in self.dependencies.items():
+                for dep in dependencies:
+                    self._referencers.setdefault(dep, set()).add(package)
+        return self._referencers
+
+    def in_degree(self, package):
+        return len(self.referencers.get(package, ()))
+
+    def out_degree(self, package):
+        return len(self.dependencies.get(package, ()))
+
+    def reachable(self, roots):
+        """
+        :param roots: [str]. root package names
+        :return: set(str). packages reachable from the roots, roots included
+        """
+        seen = set()
+        stack = list(roots)
+        while stack:
+            package = stack.pop()
+            if package in seen:
+                continue
+            seen.add(package)
+            stack.extend(self.dependencies.get(package, ()))
+        return seen
+
+    @property
+    def partial(self):
+        """
+        :return: bool. whether packages outside of the swept folder can
+                 reference the swept ones
+        """
+        return self.root not in ('', '/Game')
+
+    def contains(self, package):
+        """
+        :param package: str. unreal asset package name
+        :return: bool. whether the package is within the swept folder
+        """
+        return package.startswith(self.root + '/')
+
+
+# dependency roots that are not content packages, e.g. native classes
+CODE_ROOTS = ('/Script/', '/Engine/')
+
+
+def is_missing(graph, package, u_registry=None):
+    """
+    Whether a dependency package does not exist
+
+    :param graph: PackageGraph.
+    :param package: str. dependency package name
+    :param u_registry: unreal.AssetRegistry. (Optional) registry to look up
+                       packages outside of the swept folder, those are
+                       assumed to exist if not given
+    :return: bool.
+    """
+    if package in graph.classes or package.startswith(CODE_ROOTS):
+        return False
+    if graph.contains(package):
+        return True
+    if u_registry is None:
+        return False
+    return not u_registry.get_assets_by_package_name(package)
+
+
+def has_referencers(package, u_registry, u_options=None):
+    """
+    Whether any other package references a package, in the whole registry
+
+    :param package: str. unreal asset package name
+    :param u_registry: unreal.AssetRegistry
+    :param u_options: unreal.AssetRegistryDependencyOption. (Optional)
+    :return: bool.
+    """
+    if u_options is None:
+        u_options = unreal.AssetRegistryDependencyOptions()
+    referencers = u_registry.get_referencers(
+        package_name=package,
+        reference_options=u_options
+    ) or []
+    return any(str(ref) != package for ref in referencers)
+
+
+def audit(graph, root_classes=('World',), root_packages=(), u_registry=None,
+          u_options=None):
+    """
+    Find unreferenced, unreachable assets and dangling references
+
+    :param graph: PackageGraph.
+    :param root_classes: [str]. asset classes always kept, e.g. maps and
+                         primary asset classes
+    :param root_packages: [str]. extra packages always kept
+    :param u_registry: unreal.AssetRegistry. (Optional) registry to check
+                       dependencies outside of the swept folder exist and
+                       referencers outside of it, only the swept folder is
+                       checked if not given
+    :param u_options: unreal.AssetRegistryDependencyOption. (Optional)
+                      referencer query options
+    :return: dict. 'roots', 'unreferenced' (no referencer and not a root,
+             None for a partial sweep without u_registry as referencers
+             outside of it are unknown), 'unreachable' (not reachable from
+             any swept root) and 'dangling' ({package: [missing dependency
+             packages]})
+    """
+    root_classes = set(root_classes)
+    roots = set(root_packages) | set(
+        package for package, classes in graph.classes.items()
+        if classes & root_classes)
+
+    reached = graph.reachable(roots)
+    packages = graph.classes
+
+    dangling = dict()
+    exists = dict()
+    for package, dependencies in graph.dependencies.items():
+        for dep in dependencies:
+            if dep not in exists:
+                exists[dep] = not is_missing(graph, dep, u_registry)
+        missing = sorted(dep for dep in dependencies if not exists[dep])
+        if missing:
+            dangling[package] = missing
+
+    unreferenced = sorted(
+        package for package in packages
+        if package not in roots and not graph.in_degree(package))
+    if graph.partial:
+        if u_registry is None:
+            unreferenced = None
+        else:
+            unreferenced = [
+                package for package in unreferenced
+                if not has_referencers(package, u_registry, u_options)]
+
+    return {
+        'roots': sorted(roots),
+        'unreferenced': unreferenced,
+        'unreachable': sorted(
+            package for package in packages if package not in reached),
+        'dangling': dangling,
+    }
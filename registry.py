@@ -0,0 +1,184 @@
+"""
+Session asset registry cache
+
+Asset listings by folder and package referencers/dependencies are kept in a
+bounded LRU cache shared by the library modules for the whole editor
+session. The cache exposes the asset registry query methods it caches, so it
+can be passed anywhere an unreal.AssetRegistry is expected (e.g. as the
+u_registry of `reference` and `footprint`).
+
+Cached reads are opt-in. The python asset registry has no asset
+added/removed/renamed events, so entries are only invalidated by this
+library's own write paths (imports, moves, sequence creation), call
+`clear_cache` after changing assets any other way.
+"""
+
+from collections import OrderedDict
+
+import unreal
+
+
+# max cached query results before evicting the least recently used
+MAX_SIZE = 4096
+
+_STATE = {'cache': None}
+
+
+def _options_key(u_options):
+    """
+    Hashable key of an unreal.AssetRegistryDependencyOptions struct
+    """
+    if u_options is None:
+        return None
+    export_text = getattr(u_options, 'export_text', None)
+    if export_text:
+        return export_text()
+    return tuple(sorted(vars(u_options).items()))
+
+
+def _folder(path):
+    return str(path).split('.')[0].rsplit('/', 1)[0]
+
+
+class RegistryCache(object):
+    """
+    LRU cache in front of an unreal.AssetRegistry
+    """
+
+    def __init__(self, u_registry, max_size=MAX_SIZE):
+        """
+        :param u_registry: unreal.AssetRegistry
+        :param max_size: int. max number of cached query results
+        """
+        self.u_registry = u_registry
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, query):
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        value = query()
+        self.entries[key] = value
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+    def get_assets_by_path(self, package_path, recursive=False):
+        """
+        :param package_path: str. Unreal folder
+        :param recursive: bool. include sub folders
+        :return: [unreal.AssetData].
+        """
+        package_path = str(package_path).rstrip('/')
+        assets = self._get(
+            ('path', package_path, recursive),
+            lambda: list(self.u_registry.get_assets_by_path(
+                package_path, recursive=recursive)))
+        return list(assets)
+
+    def get_assets_by_package_name(self, package_name):
+        """
+        :param package_name: str. unreal asset package name
+        :return: [unreal.AssetData]. empty if the package does not exist
+        """
+        package_name = str(package_name)
+        assets = self._get(
+            ('package', package_name),
+            lambda: list(self.u_registry.get_assets_by_package_name(
+                package_name)))
+        return list(assets)
+
+    def get_dependencies(self, package_name, dependency_options):
+        """
+        :param package_name: str. unreal asset package name
+        :param dependency_options: unreal.AssetRegistryDependencyOptions
+        :return: [unreal.Name]. None if the package is unknown
+        """
+        package_name = str(package_name)
+        dependencies = self._get(
+            ('dependencies', package_name, _options_key(dependency_options)),
+            lambda: self.u_registry.get_dependencies(
+                package_name=package_name,
+                dependency_options=dependency_options))
+        return None if dependencies is None else list(dependencies)
+
+    def get_referencers(self, package_name, reference_options):
+        """
+        :param package_name: str. unreal asset package name
+        :param reference_options: unreal.AssetRegistryDependencyOptions
+        :return: [unreal.Name]. None if the package is unknown
+        """
+        package_name = str(package_name)
+        referencers = self._get(
+            ('referencers', package_name, _options_key(reference_options)),
+            lambda: self.u_registry.get_referencers(
+                package_name=package_name,
+                reference_options=reference_options))
+        return None if referencers is None else list(referencers)
+
+    def invalidate(self, package):
+        """
+        Forget the results a change of one package can affect: listings of
+        its folder and parent folders, its own dependencies and every
+        cached referencers (any dependency of the package may have gained or
+        lost it as referencer)
+
+        :param package: str. unreal asset package or object path
+        """
+        package = str(package).split('.')[0]
+        folder = _folder(package)
+        for key in list(self.entries):
+            kind, name = key[0], key[1]
+            if kind == 'path':
+                if name == folder or (
+                        key[2] and folder.startswith(name + '/')):
+                    del self.entries[key]
+            elif kind == 'referencers' or name == package:
+                del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """
+        :return: dict. 'entries', 'hits' and 'misses'
+        """
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+def get_registry():
+    """
+    Session registry cache over the editor asset registry
+
+    :return: RegistryCache.
+    """
+    if _STATE['cache'] is None:
+        _STATE['cache'] = RegistryCache(
+            unreal.AssetRegistryHelpers.get_asset_registry())
+    return _STATE['cache']
+
+
+def clear_cache(package=None):
+    """
+    Forget cached registry queries, e.g. after changing assets outside of
+    this library
+
+    :param package: str. (Optional) only forget what this package affects
+    """
+    cache = _STATE['cache']
+    if cache is None:
+        return
+    if package:
+        cache.invalidate(package)
+    else:
+        cache.clear()
@@ -0,0 +1,203 @@
+"""
+Output format benchmark
+
+Write sample frames locally with each output profile's encoders and compare
+write throughput and disk usage. PNG and BMP are written with the standard
+library, JPEG needs Pillow and EXR needs the OpenEXR bindings and NumPy;
+profiles whose encoders are missing are reported as skipped.
+
+Profile names match cinematic.preset.OUTPUT_PROFILES.
+"""
+
+import os
+import random
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    import OpenEXR
+    import Imath
+except ImportError:
+    OpenEXR = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EXR_AVAILABLE = OpenEXR is not None and np is not None
+
+
+def make_frame(width, height, seed=0):
+    """
+    Synthetic 8-bit RGB frame, a smooth gradient with a noisy band so
+    compression ratios sit between flat and random content
+
+    :param width: int. frame width
+    :param height: int. frame height
+    :param seed: int. noise seed
+    :return: bytes. row-major RGB pixels
+    """
+    rng = random.Random(seed)
+    ramp = [x * 255 // max(width - 1, 1) for x in range(width)]
+    row = bytes(c for value in ramp for c in (value, 128, 255 - value))
+
+    # Random.randbytes is python 3.9+, editors bundle 3.7
+    size = width * 3
+    rows = list()
+    for y in range(height):
+        rows.append(rng.getrandbits(size * 8).to_bytes(size, 'little')
+                    if y % 4 == 0 else row)
+    return b''.join(rows)
+
+
+def write_png(path, width, height, rgb, level=6):
+    def chunk(tag, data):
+        body = tag + data
+        return (struct.pack('>I', len(data)) + body +
+                struct.pack('>I', zlib.crc32(body) & 0xffffffff))
+
+    stride = width * 3
+    raw = b''.join(b'\x00' + rgb[y * stride:(y + 1) * stride]
+                   for y in range(height))
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack(
+            '>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw, level)))
+        f.write(chunk(b'IEND', b''))
+
+
+def write_bmp(path, width, height, rgb):
+    stride = width * 3
+    padding = b'\x00' * ((4 - stride % 4) % 4)
+    size = (stride + len(padding)) * height
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<2sIHHI', b'BM', 54 + size, 0, 0, 54))
+        f.write(struct.pack('<IiiHHIIiiII',
+                            40, width, height, 1, 24, 0, size, 0, 0, 0, 0))
+        # bottom-up BGR rows
+        for y in range(height - 1, -1, -1):
+            line = bytearray(rgb[y * stride:(y + 1) * stride])
+            line[0::3], line[2::3] = line[2::3], line[0::3]
+            f.write(bytes(line) + padding)
+
+
+def write_jpg(path, width, height, rgb, quality=90):
+    Image.frombytes('RGB', (width, height), rgb).save(
+        path, 'JPEG', quality=quality)
+
+
+def write_exr(path, width, height, rgb, compression='PIZ'):
+    header = OpenEXR.Header(width, height)
+    header['compression'] = Imath.Compression(
+        getattr(Imath.Compression, compression + '_COMPRESSION'))
+    half = Imath.Channel(Imath.PixelType(Imath.PixelType.HALF))
+    header['channels'] = {'R': half, 'G': half, 'B': half}
+
+    # vectorized half conversion, so the timing measures the encoder
+    pixels = np.frombuffer(rgb, dtype=np.uint8).reshape(-1, 3)
+    halves = (pixels / np.float32(255.0)).astype(np.float16)
+    channels = {name: np.ascontiguousarray(halves[:, i]).tobytes()
+                for i, name in enumerate('RGB')}
+
+    exr = OpenEXR.OutputFile(path, header)
+    exr.writePixels(channels)
+    exr.close()
+
+
+# format: (file extension, writer, available)
+WRITERS = {
+    'png': ('png', write_png, True),
+    'bmp': ('bmp', write_bmp, True),
+    'jpg': ('jpg', write_jpg, Image is not None),
+    'exr': ('exr', write_exr, EXR_AVAILABLE),
+    'exr_zip': ('exr', lambda *a: write_exr(*a, compression='ZIP'),
+                EXR_AVAILABLE),
+    'exr_none': ('exr', lambda *a: write_exr(*a, compression='NO'),
+                 EXR_AVAILABLE),
+}
+
+
+def benchmark_profile(profile, frames, width, height, folder):
+    """
+    Write frames with every format of a profile, e.g. 'exr+jpg'
+
+    :param profile: str. profile name
+    :param frames: [bytes]. RGB frames
+    :param width: int. frame width
+    :param height: int. frame height
+    :param folder: str. directory to write to
+    :return: dict. 'frames', 'seconds', 'bytes', 'fps', 'bytes_per_frame'
+             and 'mb_per_second', or 'skipped' with the missing formats
+    """
+    formats = profile.split('+')
+    missing = [fmt for fmt in formats
+               if fmt not in WRITERS or not WRITERS[fmt][2]]
+    if missing:
+        return {'skipped': missing}
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for i, rgb in enumerate(frames):
+        for fmt in formats:
+            extension, writer, _ = WRITERS[fmt]
+            path = os.path.join(
+                folder, '{}_{:05d}.{}'.format(fmt, i, extension))
+            writer(path, width, height, rgb)
+            total_bytes += os.path.getsize(path)
+    seconds = time.perf_counter() - start
+
+    return {
+        'frames': len(frames),
+        'seconds': seconds,
+        'bytes': total_bytes,
+        'fps': len(frames) / seconds if seconds else None,
+        'bytes_per_frame': total_bytes // max(len(frames), 1),
+        'mb_per_second': total_bytes / seconds / 1e6 if seconds else None,
+    }
+
+
+def benchmark(
+        profiles=('png', 'jpg', 'bmp', 'exr', 'exr+jpg'),
+        width=1280,
+        height=720,
+        count=5,
+        frames=None,
+        folder=None
+):
+    """
+    Compare write throughput and disk usage of output profiles
+
+    :param profiles: [str]. profile names
+    :param width: int. frame width
+    :param height: int. frame height
+    :param count: int. number of synthetic frames, ignored if frames given
+    :param frames: [bytes]. (Optional) RGB sample frames of width x height
+    :param folder: str. (Optional) directory to write to, a temporary
+                   directory removed afterwards if not given
+    :return: {str: dict}. result of each profile, see benchmark_profile
+    """
+    frames = frames or [make_frame(width, height, seed)
+                        for seed in range(count)]
+
+    root = folder or tempfile.mkdtemp(prefix='render_benchmark_')
+    try:
+        results = dict()
+        for profile in profiles:
+            profile_folder = os.path.join(root, profile.replace('+', '_'))
+            os.makedirs(profile_folder, exist_ok=True)
+            results[profile] = benchmark_profile(
+                profile, frames, width, height, profile_folder)
+        return results
+    finally:
+        if not folder:
+            shutil.rmtree(root, ignore_errors=True)
@@ -2,8 +2,27 @@
 https://github.com/ue4plugins/tk-unreal/blob/master/hooks/tk-multi-publish2/basic/publish_movie.py
 """
 
+import asyncio
+import time
+from concurrent import futures
+
 import unreal
 
+import registry
+
+from . import renderCmd
+from .telemetry import MemorySampler
+
+# executor modes
+PIE = 'pie'  # in-editor, blocks the editor, quick previews
+NEW_PROCESS = 'new_process'  # one separate editor process for the queue
+COMMANDLINE = 'commandline'  # parallel headless renderCmd workers
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
 ERROR_CALLBACK = unreal.OnMoviePipelineExecutorErrored()
 FINISH_CALLBACK = unreal.OnMoviePipelineExecutorFinished()
 
@@ -29,8 +48,17 @@ ERROR_CALLBACK.add_callable(render_errored)
 FINISH_CALLBACK.add_callable(render_finished)
 
 
-def get_render_presets(folder):
-    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+def get_render_presets(folder, cached=False):
+    """
+    :param folder: str. Unreal directory of the presets
+    :param cached: bool. read through the session registry cache, see
+                   `registry`
+    :return: [unreal.MoviePipelineMasterConfig].
+    """
+    if cached:
+        asset_registry = registry.get_registry()
+    else:
+        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
     asset_datas = asset_registry.get_assets_by_path(folder)
 
     return [assetData.get_asset()
@@ -39,17 +67,154 @@ def get_render_presets(folder):
                           unreal.MoviePipelineMasterConfig)]
 
 
+class RenderJob(object):
+    """
+    Handle to a single movie pipeline job submitted through the Renderer
+
+    The handle is resolved from the executor delegates, which fire on the
+    editor tick. Never block the game thread on `future.result()`; chain work
+    with `then()` or `await` the handle from a running event loop instead.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.status = PENDING
+        self.error = None
+        self.submit_time = time.time()
+        self.start_time = None
+        self.end_time = None
+        self.map_path = None
+        self.sequence_path = None
+        self.preset_path = None
+        self.output_folder = None
+        self.shot_times = dict()
+        self.peak_memory = None
+        self.future = futures.Future()
+
+    def __repr__(self):
+        return '<RenderJob {} [{}]>'.format(self.name, self.status)
+
+    def __await__(self):
+        return asyncio.wrap_future(self.future).__await__()
+
+    @property
+    def done(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    @property
+    def queue_time(self):
+        """
+        :return: float. seconds between submission and render start
+        """
+        if self.start_time is None:
+            return None
+        return self.start_time - self.submit_time
+
+    @property
+    def duration(self):
+        """
+        :return: float. seconds spent rendering
+        """
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def renew(self):
+        """
+        :return: RenderJob. pending handle of the same job for a new
+                 submission, the queue keeps jobs after they rendered
+        """
+        handle = RenderJob(self.name)
+        handle.map_path = self.map_path
+        handle.sequence_path = self.sequence_path
+        handle.preset_path = self.preset_path
+        handle.output_folder = self.output_folder
+        return handle
+
+    def start(self):
+        self.status = RUNNING
+        self.start_time = time.time()
+
+    def finish(self, is_success, error=None):
+        """
+        Resolve the job, does nothing if the job was already resolved
+
+        :param is_success: bool. whether the job rendered successfully
+        :param error: str. (Optional) error message of a failed job
+        """
+        if self.done:
+            return
+
+        if self.start_time is None:
+            self.start()
+        self.end_time = time.time()
+        self.status = SUCCEEDED if is_success else FAILED
+        self.error = error
+        self.future.set_result(self)
+
+    def then(self, func, executor=None):
+        """
+        Queue follow-up work (encode, upload...) once the job is resolved
+
+        :param func: callable. receives this RenderJob as its only argument
+        :param executor: concurrent.futures.Executor. (Optional) pool to run
+                         the follow-up in, runs on the resolving thread if
+                         not given
+        :return: concurrent.futures.Future. resolves with the func result
+        """
+        chained = futures.Future()
+
+        def run(_):
+            try:
+                chained.set_result(func(self))
+            except Exception as e:
+                chained.set_exception(e)
+
+        def schedule(future):
+            if executor:
+                executor.submit(run, future)
+            else:
+                run(future)
+
+        self.future.add_done_callback(schedule)
+        return chained
+
+
 class Renderer(object):
     subsystem = None
     queue = None
     executor = None
 
-    def __init__(self):
+    def __init__(self, telemetry=None, mode=PIE, workers=1, spec=None):
+        """
+        :param telemetry: render.telemetry.Telemetry. (Optional) recorder
+                          receiving a record for every resolved job
+        :param mode: str. executor mode, PIE, NEW_PROCESS or COMMANDLINE
+        :param workers: int. concurrent processes in COMMANDLINE mode, the
+                        presets then need to be saved assets
+        :param spec: render.renderCmd.RenderSpec. (Optional) process options
+                     in COMMANDLINE mode
+        """
+        if mode not in (PIE, NEW_PROCESS, COMMANDLINE):
+            raise ValueError('Unknown executor mode {}'.format(mode))
+
         # get movie queue subsystem for editor
         self.subsystem = unreal.get_editor_subsystem(
             unreal.MoviePipelineQueueSubsystem)
         self.queue = self.subsystem.get_queue()
-        self.executor = unreal.MoviePipelinePIEExecutor()
+        self.mode = mode
+        self.workers = workers
+        self.spec = spec
+        self.executor = None
+        if mode == PIE:
+            self.executor = unreal.MoviePipelinePIEExecutor()
+        elif mode == NEW_PROCESS:
+            self.executor = unreal.MoviePipelineNewProcessExecutor()
+        self.handles = dict()
+        self.index = dict()
+        self.telemetry = telemetry
+        self.sampler = MemorySampler()
+        self.shot_clock = None
 
         self.register_callback()
         self.clear_jobs()
@@ -59,27 +224,272 @@ class Renderer(object):
         return self.queue.get_jobs()
 
     def render(self):
-        self.subsystem.render_queue_with_executor_instance(self.executor)
+        """
+        Render all queued jobs
+
+        :return: [RenderJob]. handles of the jobs submitted to the executor
+        """
+        handles = list()
+        for job in self.jobs:
+            handle = self.handles.get(job.job_name)
+            if not handle:
+                continue
+            # resolved handles stay resolved, the job renders again under
+            # a new one
+            if handle.done:
+                handle = self.handles[job.job_name] = handle.renew()
+            handle.submit_time = time.time()
+            handles.append(handle)
+
+        # jobs render one after another, the next starts as one finishes
+        if self.mode == COMMANDLINE:
+            self.render_commandline(handles)
+            return handles
+
+        if handles:
+            handles[0].start()
+            self.shot_clock = handles[0].start_time
+
+        if self.telemetry:
+            self.sampler.start()
+        try:
+            self.subsystem.render_queue_with_executor_instance(self.executor)
+        except Exception as e:
+            # the delegates will never fire, fail the handles so awaiting
+            # code does not hang
+            for handle in handles:
+                self.resolve(handle, False, str(e))
+            self.sampler.stop()
+            raise
+        return handles
+
+    def render_commandline(self, handles):
+        """
+        Render jobs in parallel headless processes, handles resolve from the
+        worker threads
+        """
+        pool = futures.ThreadPoolExecutor(max_workers=self.workers)
+        for handle in handles:
+            pool.submit(self.run_commandline, handle)
+        pool.shutdown(wait=False)
+
+    def run_commandline(self, handle):
+        # any exception would be swallowed by the pool and leave the handle
+        # running forever
+        handle.start()
+        try:
+            renderCmd.render(
+                handle.map_path,
+                handle.sequence_path,
+                handle.preset_path,
+                output_folder=handle.output_folder,
+                telemetry=self.telemetry,
+                check=True,
+                spec=self.spec,
+                name=handle.name,
+                submit_time=handle.submit_time
+            )
+        except Exception as e:
+            handle.finish(False, str(e))
+        else:
+            handle.finish(True)
+
+    async def render_async(self):
+        """
+        Render all queued jobs and wait for every one of them to resolve,
+        must be awaited from an event loop that keeps the editor ticking
+
+        :return: [RenderJob]. resolved job handles
+        """
+        return list(await asyncio.gather(*self.render()))
 
     def clear_jobs(self):
         self.queue.delete_all_jobs()
+        self.handles.clear()
+        self.index.clear()
+
+    def rebuild_index(self):
+        """
+        Re-sync the job index after the queue was edited outside the Renderer
+        """
+        self.index = {job.job_name: job for job in self.jobs}
+        for name in list(self.handles):
+            if name not in self.index:
+                del self.handles[name]
+
+    def get_job(self, name):
+        """
+        :param name: str. job name
+        :return: unreal.MoviePipelineExecutorJob.
+        """
+        return self.index.get(name)
 
     def remove_job(self, name):
-        for job in self.jobs:
-            if job.job_name == name:
-                self.queue.delete_job(job)
+        """
+        Remove a job from the queue
+
+        :param name: str. job name
+        :return: bool. whether a job of that name was queued
+        """
+        job = self.index.pop(name, None)
+        self.handles.pop(name, None)
+        if not job:
+            return False
+
+        self.queue.delete_job(job)
+        return True
+
+    def remove_jobs(self, names):
+        """
+        Remove many jobs from the queue
+
+        :param names: [str]. job names
+        :return: [str]. names of the jobs actually removed
+        """
+        return [name for name in names if self.remove_job(name)]
+
+    def add_jobs(self, specs):
+        """
+        Add many jobs to the queue, the whole batch is validated for
+        duplicated names before any job gets allocated
+
+        :param specs: [(str, str, str, unreal.MoviePipelineMasterConfig)].
+                      name, map path, sequence path and preset of each job
+        :return: [RenderJob]. handles of the added jobs
+        """
+        names = set()
+        for spec in specs:
+            name = spec[0]
+            if name in self.index or name in names:
+                raise ValueError('Job {} already exists'.format(name))
+            names.add(name)
+
+        return [self.add_job(*spec) for spec in specs]
 
     def add_job(self, name, map_path, sequence_path, preset):
+        """
+        Add a movie pipeline job to the queue
+
+        :param name: str. job name, unique within the queue
+        :param map_path: str. Unreal path to level asset
+        :param sequence_path: str. Unreal path to level sequence asset
+        :param preset: unreal.MoviePipelineMasterConfig. render preset
+        :return: RenderJob. handle resolved when the job finishes rendering
+        """
+        if name in self.index:
+            raise ValueError('Job {} already exists'.format(name))
+
         # Create new movie pipeline job
         job = self.queue.allocate_new_job(unreal.MoviePipelineExecutorJob)
         job.job_name = name
         job.map = unreal.SoftObjectPath(map_path)
         job.sequence = unreal.SoftObjectPath(sequence_path)
         job.set_configuration(preset)
+        self.index[name] = job
+
+        handle = RenderJob(name)
+        handle.map_path = map_path
+        handle.sequence_path = sequence_path
+        handle.preset_path = preset.get_path_name()
+        u_setting = preset.find_setting_by_class(
+            unreal.MoviePipelineOutputSetting
+        )
+        handle.output_folder = u_setting.output_directory.path
+        self.handles[name] = handle
+        return handle
+
+    def get_running(self):
+        """
+        :return: RenderJob. handle of the job currently rendering
+        """
+        for handle in self.handles.values():
+            if handle.status == RUNNING:
+                return handle
+        return None
+
+    def start_next(self):
+        for handle in self.handles.values():
+            if handle.status == PENDING:
+                handle.start()
+                self.shot_clock = handle.start_time
+                return
+
+    def resolve(self, handle, is_success, error=None):
+        """
+        Resolve a job handle and record its telemetry
+        """
+        if handle.done:
+            return
+
+        handle.peak_memory = self.sampler.peak
+        self.sampler.reset()
+        handle.finish(is_success, error)
+
+        if self.telemetry:
+            self.telemetry.record_job(
+                handle.name,
+                'editor',
+                is_success,
+                handle.submit_time,
+                handle.start_time,
+                handle.end_time,
+                output_folder=handle.output_folder,
+                shot_times=handle.shot_times,
+                peak_memory=handle.peak_memory
+            )
+
+    def on_shot_finished(self, output_data):
+        handle = self.handles.get(output_data.job.job_name)
+        if not handle:
+            return
+
+        now = time.time()
+        for shot_data in output_data.shot_data:
+            shot = shot_data.shot
+            name = '{}.{}'.format(shot.outer_name, shot.inner_name)
+            handle.shot_times[name] = now - (self.shot_clock or now)
+        self.shot_clock = now
+
+    def on_job_finished(self, u_job, is_success):
+        handle = self.handles.get(u_job.job_name)
+        if handle:
+            self.resolve(handle, is_success)
+        self.start_next()
+
+    def on_errored(self, executor, pipeline, is_fatal, error_msg):
+        handle = None
+        if pipeline:
+            handle = self.handles.get(pipeline.get_current_job().job_name)
+        handle = handle or self.get_running()
+        if handle:
+            self.resolve(handle, False, str(error_msg))
+
+    def on_finished(self, executor, is_success):
+        # resolve anything the per-job delegate did not report
+        for handle in self.handles.values():
+            self.resolve(
+                handle, is_success, None if is_success else 'Executor failed')
+        self.sampler.stop()
 
     def register_callback(self):
         global ERROR_CALLBACK
         global FINISH_CALLBACK
 
+        if not self.executor:
+            return
+
         self.executor.on_executor_errored_delegate = ERROR_CALLBACK
         self.executor.on_executor_finished_delegate = FINISH_CALLBACK
+
+        # per job and shot delegates are only declared on the PIE executor,
+        # a new process queue resolves from the executor finished delegate
+        if self.mode == PIE:
+            executor = self.executor
+            executor.on_individual_job_finished_delegate.add_callable(
+                self.on_job_finished)
+            executor.on_individual_shot_work_finished_delegate.add_callable(
+                self.on_shot_finished)
+        self.executor.on_executor_errored_delegate.add_callable(
+            self.on_errored)
+        self.executor.on_executor_finished_delegate.add_callable(
+            self.on_finished)
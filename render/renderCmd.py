@@ -3,92 +3,257 @@ https://docs.unrealengine.com/4.26/en-US/AnimatingObjects/Sequencer/Workflow/Ren
 https://forums.unrealengine.com/t/ue5-rendering-from-command-line-not-working-anymore/538400
 """
 
+import functools
 import subprocess
+import time
+from typing import NamedTuple, Tuple
+
+from .telemetry import MemorySampler
 
 UNREAL_EXE = ''
 U_PROJECT = ''
 
+MOVIE_FORMATS = ('JPG', 'BMP', 'PNG', 'Video')
+
 
-def render(u_level_file, u_level_seq_file, u_preset_file):
+class RenderSpec(NamedTuple):
     """
-    Render through commandline using the movie render queue with preset
+    Process level render options shared by many jobs, hashable so the
+    built arguments can be cached per spec
 
-    :param u_level_file: str. Unreal path to level asset
-    :param u_level_seq_file: str. Unreal path to level sequence asset
-    :param u_preset_file: str. Unreal path to movie render queue preset asset
-    :return:
+    frame_rate, movie_format and quality only apply to the legacy movie scene
+    capture, the movie render queue takes them from its preset and rejects
+    non-default values
     """
-    command = [
-        UNREAL_EXE,
-        U_PROJECT,
-        u_level_file,
+    width: int = 800
+    height: int = 600
+    frame_rate: int = 24  # legacy capture only
+    movie_format: str = 'Video'  # legacy capture only
+    quality: int = 100  # legacy capture compression quality in percentage
+    texture_streaming: bool = False  # disabled for final render
+    offscreen: bool = False  # no window, for headless farm nodes
+    extra_flags: Tuple[str, ...] = ()
 
-        # required
-        "-LevelSequence=%s" % u_level_seq_file,  # The sequence to render
-        "-MoviePipelineConfig=\"%s\"" % u_preset_file,
-        "-game",
 
-        # options
+DEFAULT_SPEC = RenderSpec()
+LEGACY_SPEC = RenderSpec(width=1920, height=1080)
+
+LEGACY_FIELDS = ('frame_rate', 'movie_format', 'quality')
+
+
+def validate_spec(spec, legacy=False):
+    """
+    :param spec: RenderSpec.
+    :param legacy: bool. validate for the legacy movie scene capture
+    :raise ValueError: on out of range options, or legacy only options set
+                       for the movie render queue
+    """
+    if not legacy:
+        for field in LEGACY_FIELDS:
+            if getattr(spec, field) != getattr(DEFAULT_SPEC, field):
+                raise ValueError(
+                    '{} is set by the movie render queue preset, it only '
+                    'applies to the legacy capture'.format(field))
+    if spec.width <= 0 or spec.height <= 0:
+        raise ValueError('Invalid resolution {}x{}'.format(
+            spec.width, spec.height))
+    if spec.frame_rate <= 0:
+        raise ValueError('Invalid frame rate {}'.format(spec.frame_rate))
+    if spec.movie_format not in MOVIE_FORMATS:
+        raise ValueError('Movie format has to be one of {}'.format(
+            MOVIE_FORMATS))
+    if not 1 <= spec.quality <= 100:
+        raise ValueError('Quality has to be within 1-100')
+    for flag in spec.extra_flags:
+        if not flag.startswith('-'):
+            raise ValueError('Invalid flag {}'.format(flag))
+
+
+def build_args(spec, legacy=False):
+    """
+    Validate a spec and build its shared process arguments, cached per spec
+
+    :param spec: RenderSpec.
+    :param legacy: bool. build for the legacy movie scene capture
+    :return: (str). arguments following the per-job arguments
+    """
+    # lists are accepted for extra_flags but are not hashable
+    if not isinstance(spec.extra_flags, tuple):
+        spec = spec._replace(extra_flags=tuple(spec.extra_flags))
+    return _build_args(spec, legacy)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_args(spec, legacy):
+    validate_spec(spec, legacy)
+
+    args = [
+        "-game",
         "-NoLoadingScreen",
         "-log",
-        "-NoTextureStreaming",  # for final render
         "-NoScreenMessages",  # no screen debug message
-
-        # window size
-        "-Windowed",
-        "-ResX=800",
-        "-ResY=600",
     ]
-    print(command)
-    proc = subprocess.Popen(
-        command,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT
-    )
-    return proc.communicate()
+    if not spec.texture_streaming:
+        args.append("-NoTextureStreaming")
 
+    if legacy:
+        args.extend([
+            "-MovieCinematicMode=yes",
+            "-MovieFormat=%s" % spec.movie_format,
+            "-MovieFrameRate=%s" % spec.frame_rate,
+            "-MovieQuality=%s" % spec.quality,
+        ])
 
-def render_legacy(u_level_file, u_level_seq_file, output_folder):
+    # window size
+    if spec.offscreen:
+        args.extend(["-RenderOffscreen", "-Unattended", "-NoSplash"])
+    else:
+        args.append("-Windowed")
+    args.extend(["-ResX=%s" % spec.width, "-ResY=%s" % spec.height])
+
+    args.extend(spec.extra_flags)
+    return tuple(args)
+
+
+def get_base_command(u_level_file):
+    if not UNREAL_EXE or not U_PROJECT:
+        raise ValueError('UNREAL_EXE and U_PROJECT have to be set')
+    return [UNREAL_EXE, U_PROJECT, u_level_file]
+
+
+def get_command(u_level_file, u_level_seq_file, u_preset_file, spec=None):
     """
-    Render through commandline using the legacy movie scene capture
+    Command rendering through the movie render queue with preset
 
     :param u_level_file: str. Unreal path to level asset
     :param u_level_seq_file: str. Unreal path to level sequence asset
-    :param output_folder: str. system folder to export out
-    :return:
+    :param u_preset_file: str. Unreal path to movie render queue preset asset
+    :param spec: RenderSpec. (Optional) process options
+    :return: [str].
     """
-    command = [
-        UNREAL_EXE,
-        U_PROJECT,
-        u_level_file,
+    command = get_base_command(u_level_file)
+    command.extend([
+        "-LevelSequence=%s" % u_level_seq_file,  # The sequence to render
+        "-MoviePipelineConfig=\"%s\"" % u_preset_file,
+    ])
+    command.extend(build_args(spec or DEFAULT_SPEC))
+    return command
+
 
-        # required
+def get_legacy_command(u_level_file, u_level_seq_file, output_folder,
+                       spec=None):
+    """
+    Command rendering through the legacy movie scene capture
+
+    :param u_level_file: str. Unreal path to level asset
+    :param u_level_seq_file: str. Unreal path to level sequence asset
+    :param output_folder: str. system folder to export out
+    :param spec: RenderSpec. (Optional) process options
+    :return: [str].
+    """
+    command = get_base_command(u_level_file)
+    command.extend([
         "-LevelSequence=%s" % u_level_seq_file,  # The sequence to render
         "-MovieSceneCaptureType=/Script/MovieSceneCapture.AutomatedLevelSequenceCapture",
-        "-NoLoadingScreen",
-        "-game",
-        "-log",
-        "-MovieCinematicMode=yes",
-
-        # general property
         "-MovieFolder=%s" % output_folder,
+    ])
+    command.extend(build_args(spec or LEGACY_SPEC, legacy=True))
+    return command
 
-        # if doing .avi
-        "-MovieFormat=Video",  # JPG, BMP, PNG or Video
-        "-MovieFrameRate=24",
-        "-MovieQuality=100",  # compression quality in percentage
-        "-Windowed",
-        "-ResX=1920",
-        "-ResY=1080",
 
-        # other
-        "-NoTextureStreaming",  # for final render
-        "-NoScreenMessages",  # no screen debug message
-    ]
+def run(command, name=None, output_folder=None, telemetry=None, check=False,
+        submit_time=None):
+    """
+    Launch a render process and wait for it to exit
+
+    :param command: [str]. process arguments
+    :param name: str. (Optional) job name used in telemetry records
+    :param output_folder: str. (Optional) system folder of the render outputs
+    :param telemetry: render.telemetry.Telemetry. (Optional) recorder
+                      receiving a record of the process
+    :param check: bool. raise subprocess.CalledProcessError on a non-zero
+                  exit code
+    :param submit_time: float. (Optional) epoch time the job was queued,
+                        the process launch time if not given
+    :return: (bytes, bytes). process stdout and stderr
+    """
     print(command)
+    start_time = time.time()
     proc = subprocess.Popen(
         command,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT
     )
-    return proc.communicate()
+    sampler = MemorySampler(proc.pid).start() if telemetry else None
+    result = proc.communicate()
+
+    if telemetry:
+        telemetry.record_job(
+            name or command[0],
+            'cmd',
+            proc.returncode == 0,
+            start_time if submit_time is None else submit_time,
+            start_time,
+            time.time(),
+            output_folder=output_folder,
+            peak_memory=sampler.stop()
+        )
+
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(
+            proc.returncode, command, output=result[0])
+    return result
+
+
+def render(
+        u_level_file,
+        u_level_seq_file,
+        u_preset_file,
+        output_folder=None,
+        telemetry=None,
+        check=False,
+        spec=None,
+        name=None,
+        submit_time=None
+):
+    """
+    Render through commandline using the movie render queue with preset
+
+    :param u_level_file: str. Unreal path to level asset
+    :param u_level_seq_file: str. Unreal path to level sequence asset
+    :param u_preset_file: str. Unreal path to movie render queue preset asset
+    :param output_folder: str. (Optional) system folder the preset writes
+                          to, used for telemetry output metrics
+    :param telemetry: render.telemetry.Telemetry. (Optional) job recorder
+    :param check: bool. raise subprocess.CalledProcessError on failure
+    :param spec: RenderSpec. (Optional) process options
+    :param name: str. (Optional) job name of the telemetry record, the
+                 sequence path if not given
+    :param submit_time: float. (Optional) epoch time the job was queued
+    :return:
+    """
+    command = get_command(u_level_file, u_level_seq_file, u_preset_file, spec)
+    return run(command, name or u_level_seq_file, output_folder, telemetry,
+               check, submit_time)
+
+
+def render_legacy(
+        u_level_file,
+        u_level_seq_file,
+        output_folder,
+        telemetry=None,
+        spec=None
+):
+    """
+    Render through commandline using the legacy movie scene capture
+
+    :param u_level_file: str. Unreal path to level asset
+    :param u_level_seq_file: str. Unreal path to level sequence asset
+    :param output_folder: str. system folder to export out
+    :param telemetry: render.telemetry.Telemetry. (Optional) job recorder
+    :param spec: RenderSpec. (Optional) process options
+    :return:
+    """
+    command = get_legacy_command(
+        u_level_file, u_level_seq_file, output_folder, spec)
+    return run(command, u_level_seq_file, output_folder, telemetry)
@@ -0,0 +1,242 @@
+"""
+Render job telemetry
+
+Records per job timings, memory and output metrics as JSON lines so a run
+can be aggregated into a capacity planning summary afterwards.
+"""
+
+import json
+import os
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class JobRecord(object):
+    """
+    Metrics of a single rendered job, all times are in seconds
+    """
+
+    def __init__(self, name, mode, success=True):
+        self.name = name
+        self.mode = mode
+        self.success = success
+        self.queue_wait = None
+        self.duration = None
+        self.first_frame = None
+        self.frame_count = 0
+        self.frame_times = list()
+        self.shot_times = dict()
+        self.peak_memory = None
+        self.output_bytes = 0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'mode': self.mode,
+            'success': self.success,
+            'queue_wait': self.queue_wait,
+            'duration': self.duration,
+            'first_frame': self.first_frame,
+            'frame_count': self.frame_count,
+            'frame_times': self.frame_times,
+            'shot_times': self.shot_times,
+            'peak_memory': self.peak_memory,
+            'output_bytes': self.output_bytes,
+        }
+
+
+class MemorySampler(object):
+    """
+    Poll the resident memory of a process in a background thread and keep
+    the peak, only active when psutil is available
+    """
+
+    def __init__(self, pid=None, interval=0.5):
+        self.pid = pid or os.getpid()
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not psutil:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        return self.peak
+
+    def reset(self):
+        self.peak = None
+
+    def _run(self):
+        try:
+            proc = psutil.Process(self.pid)
+            while not self._stop.is_set():
+                rss = proc.memory_info().rss
+                self.peak = max(self.peak or 0, rss)
+                self._stop.wait(self.interval)
+        except psutil.Error:
+            # process exited
+            pass
+
+
+def scan_output(folder, since=0.0):
+    """
+    Collect files written in an output folder after a point in time
+
+    :param folder: str. system folder of the render outputs
+    :param since: float. epoch time, older files are ignored
+    :return: ([float], int). sorted modification times and total bytes
+    """
+    mtimes = list()
+    total = 0
+    if not folder or not os.path.isdir(folder):
+        return mtimes, total
+
+    for root, _, files in os.walk(folder):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            if stat.st_mtime < since:
+                continue
+            mtimes.append(stat.st_mtime)
+            total += stat.st_size
+
+    return sorted(mtimes), total
+
+
+class Telemetry(object):
+    """
+    Collect job records and optionally stream them to a JSON lines file
+    """
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self.records = list()
+
+    def record(self, record):
+        """
+        :param record: JobRecord.
+        """
+        self.records.append(record)
+        if self.log_path:
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record.to_dict()) + '\n')
+        return record
+
+    def record_job(
+            self,
+            name,
+            mode,
+            success,
+            submit_time,
+            start_time,
+            end_time,
+            output_folder=None,
+            shot_times=None,
+            peak_memory=None
+    ):
+        """
+        Build a record from job timestamps and its output folder
+
+        :param name: str. job name
+        :param mode: str. how the job was rendered, e.g. 'editor' or 'cmd'
+        :param success: bool. whether the job rendered successfully
+        :param submit_time: float. epoch time the job was submitted
+        :param start_time: float. epoch time the job started rendering
+        :param end_time: float. epoch time the job finished rendering
+        :param output_folder: str. (Optional) system folder of the outputs,
+                              used for frame timings and bytes written
+        :param shot_times: {str: float}. (Optional) seconds per shot
+        :param peak_memory: int. (Optional) peak resident bytes
+        :return: JobRecord.
+        """
+        record = JobRecord(name, mode, success)
+        record.queue_wait = start_time - submit_time
+        record.duration = end_time - start_time
+        record.shot_times = dict(shot_times or {})
+        record.peak_memory = peak_memory
+
+        mtimes, record.output_bytes = scan_output(output_folder, start_time)
+        record.frame_count = len(mtimes)
+        if mtimes:
+            record.first_frame = mtimes[0] - start_time
+            record.frame_times = [
+                b - a for a, b in zip(mtimes, mtimes[1:])]
+
+        return self.record(record)
+
+    def summary(self):
+        return summarize([record.to_dict() for record in self.records])
+
+
+def load_records(log_path):
+    """
+    :param log_path: str. JSON lines file written by Telemetry
+    :return: [dict]. job records
+    """
+    with open(log_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    index = int(round((len(values) - 1) * percent / 100.0))
+    return values[index]
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def summarize(records):
+    """
+    Aggregate job records across a run
+
+    :param records: [dict]. job records, see JobRecord.to_dict
+    :return: dict. run totals and per metric mean/percentiles
+    """
+    frame_times = [t for record in records for t in record['frame_times']]
+    shot_times = [t for record in records
+                  for t in record['shot_times'].values()]
+
+    def collect(key):
+        return [record[key] for record in records
+                if record[key] is not None]
+
+    summary = {
+        'jobs': len(records),
+        'failed': len([r for r in records if not r['success']]),
+        'frames': sum(record['frame_count'] for record in records),
+        'output_bytes': sum(record['output_bytes'] for record in records),
+        'render_time': sum(collect('duration')),
+        'peak_memory': max(collect('peak_memory') or [None]),
+    }
+    for key, values in (
+            ('queue_wait', collect('queue_wait')),
+            ('duration', collect('duration')),
+            ('first_frame', collect('first_frame')),
+            ('frame_time', frame_times),
+            ('shot_time', shot_times)):
+        summary[key] = {
+            'mean': _mean(values),
+            'p50': _percentile(values, 50),
+            'p95': _percentile(values, 95),
+            'max': max(values) if values else None,
+        }
+
+    return summary
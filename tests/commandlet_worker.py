@@ -0,0 +1,20 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import commandlet
+
+
+def process(item):
+    if item == 'raise':
+        raise RuntimeError('bad item')
+    if item == 'crash':
+        sys.exit(3)
+    time.sleep(float(os.environ.get('STUB_ITEM_SECONDS', 0)))
+    return item * 2
+
+
+if __name__ == '__main__':
+    commandlet.serve(process)
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the library is imported from the repo root, `unreal` is the offline fake
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'fake')]
+
+import unreal  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_engine():
+    """
+    Empty fake engine and library caches for every test
+    """
+    import registry
+    from cinematic import frametime, sequence
+
+    unreal.reset()
+    registry.clear_cache()
+    frametime.clear_cache()
+    sequence.SHOT_CACHE.clear()
+    yield unreal
+
+
+@pytest.fixture
+def asset_tools():
+    return unreal.AssetToolsHelpers.get_asset_tools()
+
+
+@pytest.fixture
+def new_sequence(asset_tools):
+    def create(name, folder='/Game/Cinematics'):
+        return asset_tools.create_asset(
+            name, folder, unreal.LevelSequence,
+            unreal.LevelSequenceFactoryNew())
+    return create
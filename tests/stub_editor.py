@@ -0,0 +1,38 @@
+"""
+Stand-in for the Unreal editor commandline executable
+
+Run as `python stub_editor.py <uproject> -run=pythonscript -script="..."`,
+the script runs like in the pythonscript commandlet. STUB_LOG_BYTES bytes
+are written to stdout first, like a verbose -stdout editor log.
+
+Without -script, e.g. a -LevelSequence render, it exits after
+STUB_RENDER_SECONDS.
+"""
+
+import os
+import runpy
+import sys
+import time
+
+
+def main(argv):
+    script_arg = next(
+        (arg for arg in argv if arg.startswith('-script=')), None)
+    if script_arg is None:
+        time.sleep(float(os.environ.get('STUB_RENDER_SECONDS', 0)))
+        return
+
+    script_args = script_arg[len('-script='):].strip('"').split()
+
+    log_bytes = int(os.environ.get('STUB_LOG_BYTES', 0))
+    line = b'LogPython: stub editor log line\n'
+    for _ in range(log_bytes // len(line)):
+        sys.stdout.buffer.write(line)
+    sys.stdout.flush()
+
+    sys.argv = script_args
+    runpy.run_path(script_args[0], run_name='__main__')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
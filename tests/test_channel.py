@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import unreal
+
+from cinematic import channel
+
+
+@pytest.fixture
+def transform_section():
+    return unreal.MovieScene3DTransformTrack().add_section()
+
+
+def test_export_import_roundtrip(transform_section):
+    times = np.arange(0, 100, 5)
+    values = np.sin(times / 10.0)
+    written = channel.import_channels(
+        transform_section, {'Location.X': {'times': times, 'values': values}})
+    assert written == {'Location.X': len(times)}
+
+    exported = channel.export_channels(transform_section)
+    assert set(exported) == set(
+        '{}.{}'.format(group, axis)
+        for group in ('Location', 'Rotation', 'Scale') for axis in 'XYZ')
+    np.testing.assert_array_equal(exported['Location.X']['times'], times)
+    np.testing.assert_allclose(exported['Location.X']['values'], values)
+    assert len(exported['Location.Y']['times']) == 0
+
+
+def test_import_sorts_and_clears(transform_section):
+    u_channel = channel.get_channels(transform_section)['Rotation.Z']
+    channel.import_channel(u_channel, [0, 1, 2], [0.0, 1.0, 2.0])
+    channel.import_channel(u_channel, [20, 10], [2.0, 1.0],
+                           arrive=[0.5, 0.25], leave=[0.5, 0.25])
+
+    exported = channel.export_channel(u_channel)
+    assert exported['times'].tolist() == [10, 20]
+    assert exported['arrive'].tolist() == [0.25, 0.5]
+
+
+def test_import_rejects_mismatched_arrays(transform_section):
+    with pytest.raises(ValueError):
+        channel.import_channels(
+            transform_section, {'Location.X': {'times': [0, 1], 'values': [0.0]}})
+    with pytest.raises(ValueError):
+        channel.import_channels(
+            transform_section, {'Color.R': {'times': [0], 'values': [0.0]}})
+
+
+@pytest.mark.parametrize('tolerance', [0.01, 0.1, 1.0])
+def test_reduction_stays_within_tolerance(tolerance):
+    rng = np.random.RandomState(7)
+    times = np.arange(2000)
+    values = np.cumsum(rng.normal(size=len(times)))
+
+    keep = channel.reduce_keys(times, values, tolerance)
+    assert keep[0] == 0 and keep[-1] == len(times) - 1
+    assert len(keep) < len(times)
+    assert channel.max_deviation(times, values, keep) <= tolerance
+
+
+def test_reduced_import_writes_kept_keys(transform_section):
+    u_channel = channel.get_channels(transform_section)['Location.Z']
+    times = np.arange(100)
+    values = np.where(times < 50, times, 100 - times).astype(float)
+
+    assert channel.import_channel(u_channel, times, values, tolerance=0.1) == 3
+    assert channel.export_channel(u_channel)['times'].tolist() == [0, 50, 99]
+
+
+def test_sub_frame_keys_roundtrip(new_sequence):
+    u_seq = new_sequence('mocap')
+    u_track = u_seq.add_master_track(unreal.MovieScene3DTransformTrack)
+    u_section = u_track.add_section()
+    # 120 Hz samples in a 30 fps sequence of 24000 ticks per second
+    times = np.arange(0, 24000, 200)
+    values = np.cos(times / 3000.0)
+    channel.import_channels(
+        u_section, {'Location.X': {'times': times, 'values': values}})
+
+    exported = channel.export_channels(u_section)['Location.X']
+    np.testing.assert_array_equal(exported['times'], times)
+
+    channel.import_channels(u_section, {'Location.X': exported})
+    exported = channel.export_channels(u_section)['Location.X']
+    assert len(np.unique(exported['times'])) == len(times)
+
+    frames = channel.export_channels(
+        u_section, unreal.SequenceTimeUnit.DISPLAY_RATE)['Location.X']
+    assert frames['times'][:4].tolist() == [0, 0, 0, 0]
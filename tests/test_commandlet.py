@@ -0,0 +1,54 @@
+import os
+import sys
+
+import commandlet
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STUB = os.path.join(HERE, 'stub_editor.py')
+WORKER = os.path.join(HERE, 'commandlet_worker.py')
+
+
+def make_runner(workers, timeout=None):
+    # the interpreter is the "editor" and the stub its project argument
+    return commandlet.Runner(sys.executable, STUB, WORKER, workers,
+                             timeout=timeout)
+
+
+def test_shard_is_contiguous_and_balanced():
+    shards = commandlet.shard(list('abcdefg'), 3)
+    assert [len(s) for s in shards] == [3, 2, 2]
+    assert [item for s in shards for _, item in s] == list('abcdefg')
+
+
+def test_results_keep_work_list_order():
+    results = make_runner(3).run([1, 2, 3, 4, 5])
+    assert [r['result'] for r in results] == [2, 4, 6, 8, 10]
+    assert [r['item'] for r in results] == [1, 2, 3, 4, 5]
+
+
+def test_item_errors_and_crashed_shards():
+    runner = make_runner(2)
+    results = runner.run([1, 'raise', 'crash', 4])
+    assert results[0]['result'] == 2
+    assert 'bad item' in results[1]['error']
+    # the crashed process fails its whole shard
+    assert results[2]['error'].startswith('Exit code 3')
+    assert results[3]['error'].startswith('Exit code 3')
+    assert runner.stats['failed_shards'] == 1
+
+
+def test_verbose_workers_run_in_parallel(monkeypatch):
+    monkeypatch.setenv('STUB_LOG_BYTES', str(2 * 1024 * 1024))
+    monkeypatch.setenv('STUB_ITEM_SECONDS', '1')
+    runner = make_runner(4)
+    results = runner.run([1, 2, 3, 4])
+    assert all('result' in r for r in results)
+    assert runner.stats['seconds'] < 3
+
+
+def test_timeout_is_a_deadline_from_launch(monkeypatch):
+    monkeypatch.setenv('STUB_ITEM_SECONDS', '5')
+    runner = make_runner(3, timeout=1)
+    results = runner.run([1, 2, 3])
+    assert all(r['error'] == 'Timed out' for r in results)
+    assert runner.stats['seconds'] < 3
@@ -0,0 +1,52 @@
+import unreal
+
+from cinematic import conform
+from cinematic.conform import Edit, SequenceDescription, Shot
+
+
+def make_target(*shots):
+    return SequenceDescription(shots=[Shot(*shot) for shot in shots])
+
+
+def test_conform_builds_then_is_idempotent(new_sequence):
+    u_master = new_sequence('master')
+    sh010 = new_sequence('sh010').get_path_name()
+    sh020 = new_sequence('sh020').get_path_name()
+    target = make_target((sh010, 0, 50), (sh020, 50, 120))
+
+    edits = conform.conform(u_master, target)
+    assert [edit.action for edit in edits] == [conform.ADD] * 2
+    assert sorted(conform.read(u_master).shots) == sorted(target.shots)
+
+    unreal.CALLS.clear()
+    assert conform.conform(u_master, target) == []
+    assert not unreal.CALLS['MovieSceneTrack.add_section']
+
+
+def test_reused_sub_sequence_keeps_every_shot(new_sequence):
+    u_master = new_sequence('master')
+    sh010 = new_sequence('sh010').get_path_name()
+    target = make_target((sh010, 0, 50), (sh010, 50, 100), (sh010, 100, 150))
+
+    conform.conform(u_master, target)
+    assert sorted(conform.read(u_master).shots) == sorted(target.shots)
+
+    # only the moved shot is touched, the identical ones are matched
+    retimed = make_target((sh010, 0, 50), (sh010, 50, 100), (sh010, 100, 180))
+    edits = conform.conform(u_master, retimed)
+    assert edits == [Edit(conform.UPDATE, Shot(sh010, 100, 150),
+                          Shot(sh010, 100, 180))]
+    assert sorted(conform.read(u_master).shots) == sorted(retimed.shots)
+
+    trimmed = make_target((sh010, 0, 50))
+    edits = conform.conform(u_master, trimmed)
+    assert [edit.action for edit in edits] == [conform.REMOVE] * 2
+    assert conform.read(u_master).shots == trimmed.shots
+
+
+def test_diff_orders_removals_first():
+    current = make_target(('/Game/a', 0, 10), ('/Game/b', 10, 20))
+    target = make_target(('/Game/b', 10, 30), ('/Game/c', 30, 40))
+    edits = conform.diff(current, target)
+    assert [edit.action for edit in edits] == [
+        conform.REMOVE, conform.UPDATE, conform.ADD]
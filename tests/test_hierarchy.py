@@ -0,0 +1,37 @@
+import pytest
+import unreal
+
+from cinematic import hierarchy, section, sequence
+
+
+def add_sub_section(u_parent, u_sub_seq, start, end, track_type=None):
+    u_track = sequence.add_track(
+        u_parent, track_type or unreal.MovieSceneCinematicShotTrack)
+    u_section = u_track.add_section()
+    section.set_sub_seq(u_section, u_sub_seq)
+    section.set_range(u_section, start, end)
+    return u_section
+
+
+def test_nested_offset_scale_and_rate(new_sequence):
+    u_master = new_sequence('master')
+    u_shot = new_sequence('sh010')
+    u_shot.set_display_rate(unreal.FrameRate(24, 1))
+    u_nested = new_sequence('sh010_fx')
+
+    u_section = add_sub_section(u_master, u_shot, 100, 200)
+    params = u_section.get_editor_property('parameters')
+    # 10 frames of the 24 fps shot at its 24000 ticks per second
+    params.start_frame_offset = unreal.FrameNumber(10000)
+    params.time_scale = 2.0
+    add_sub_section(u_shot, u_nested, 20, 40, unreal.MovieSceneSubTrack)
+
+    shot, nested = hierarchy.HierarchyWalker().flatten(u_master)
+    # 30/24 master frames per shot frame, played twice as fast
+    assert shot.scale == pytest.approx(0.625)
+    assert shot.to_master(10) == pytest.approx(100)
+    assert (shot.start, shot.end) == (100, 200)
+
+    assert nested.depth == 1
+    assert nested.start == pytest.approx(106.25)
+    assert nested.end == pytest.approx(118.75)
@@ -0,0 +1,69 @@
+import importlib
+import sys
+
+import unreal
+
+import menu
+
+
+def get_main_menu():
+    return unreal.ToolMenus.get().register_menu('LevelEditor.MainMenu')
+
+
+def run_entry(entry):
+    _, string = entry.command
+    exec(string, {})
+
+
+def test_lazy_entry_survives_reload(tmp_path, monkeypatch):
+    (tmp_path / 'lazy_tool.py').write_text(
+        'CLICKS = []\n'
+        'def run():\n'
+        '    CLICKS.append(1)\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry = menu.create_lazy_entry(
+        get_main_menu(), 'Lazy Tool', 'lazy_tool', 'run')
+    assert 'lazy_tool' not in sys.modules
+
+    importlib.reload(menu)
+    run_entry(entry)
+    run_entry(entry)
+    assert sys.modules['lazy_tool'].CLICKS == [1, 1]
+    report = menu.get_import_report()
+    assert [r['command'] for r in report] == ['lazy_tool:run']
+    monkeypatch.delitem(sys.modules, 'lazy_tool')
+
+
+def test_menu_tree_keys_items_by_path():
+    settings = {'type': 'entry', 'name': 'Settings', 'command': 'pass'}
+    created, timings = menu.build_menu_tree(get_main_menu(), [
+        {'type': 'menu', 'name': 'Render', 'children': [settings]},
+        {'type': 'menu', 'name': 'Layout', 'children': [
+            {'type': 'section', 'name': 'Tools', 'children': [settings]},
+        ]},
+    ])
+    assert sorted(created) == [
+        ('Layout',), ('Layout', 'Tools', 'Settings'),
+        ('Render',), ('Render', 'Settings')]
+    assert created[('Render', 'Settings')] is not created[
+        ('Layout', 'Tools', 'Settings')]
+    assert timings['items'] == 5
+
+
+def test_list_menu_refreshes_incrementally():
+    menus = unreal.ToolMenus.get()
+    menu.REGISTRY.clear()
+    before = menu.list_menu()
+    menus.register_menu('Studio.Render')
+    menus.register_menu('Studio.Layout')
+    names = menu.list_menu()
+    assert names == before + ['Studio.Render', 'Studio.Layout']
+
+    # only menus registered since the last refresh are probed
+    lookups = menu.REGISTRY.lookups
+    menus.register_menu('Studio.Review')
+    assert menu.list_menu()[-1] == 'Studio.Review'
+    assert menu.REGISTRY.lookups - lookups == 1 + menu.REGISTRY.max_misses
+
+    # num bounds the menu indices
+    assert menu.list_menu(len(before) + 1) == before + ['Studio.Render']
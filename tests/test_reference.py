@@ -0,0 +1,64 @@
+import unreal
+
+import reference
+import registry
+
+
+def build(root):
+    return reference.PackageGraph.build(
+        unreal.AssetRegistryHelpers.get_asset_registry(),
+        unreal.AssetRegistryDependencyOptions(), root)
+
+
+def make_project():
+    unreal.add_asset('/Game/Maps/Main', unreal.World,
+                     dependencies=['/Game/Props/Chair', '/Script/Engine'])
+    unreal.add_asset('/Game/Props/Chair', unreal.StaticMesh,
+                     dependencies=['/Game/Props/Wood', '/Game/Tex/Gone'])
+    unreal.add_asset('/Game/Props/Wood', unreal.Material,
+                     dependencies=['/Game/Tex/Oak'])
+    unreal.add_asset('/Game/Props/Unused', unreal.StaticMesh)
+    unreal.add_asset('/Game/Tex/Oak', unreal.Texture2D)
+
+
+def test_full_sweep():
+    make_project()
+    result = reference.audit(build('/Game'))
+    assert result['roots'] == ['/Game/Maps/Main']
+    assert result['unreferenced'] == ['/Game/Props/Unused']
+    assert result['unreachable'] == ['/Game/Props/Unused']
+    assert result['dangling'] == {'/Game/Props/Chair': ['/Game/Tex/Gone']}
+
+
+def test_subfolder_sweep_checks_outside_referencers():
+    make_project()
+    u_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    graph = build('/Game/Props')
+
+    # the chair is only referenced by the map, outside of the sweep
+    result = reference.audit(graph, u_registry=u_registry)
+    assert result['unreferenced'] == ['/Game/Props/Unused']
+    # only missing packages dangle, not packages outside of the sweep
+    assert result['dangling'] == {'/Game/Props/Chair': ['/Game/Tex/Gone']}
+
+
+def test_subfolder_sweep_without_registry():
+    make_project()
+    result = reference.audit(build('/Game/Props'))
+    assert result['unreferenced'] is None
+    assert result['dangling'] == {}
+
+
+def test_audit_through_registry_cache():
+    make_project()
+    cache = registry.get_registry()
+    graph = reference.PackageGraph.build(
+        cache, unreal.AssetRegistryDependencyOptions(), '/Game/Props')
+
+    result = reference.audit(graph, u_registry=cache)
+    assert result['unreferenced'] == ['/Game/Props/Unused']
+    assert result['dangling'] == {'/Game/Props/Chair': ['/Game/Tex/Gone']}
+
+    unreal.add_asset('/Game/Tex/Gone')
+    registry.clear_cache('/Game/Tex/Gone')
+    assert reference.audit(graph, u_registry=cache)['dangling'] == {}
@@ -0,0 +1,59 @@
+import unreal
+
+import editor
+import registry
+from cinematic import sequence
+
+
+def test_cache_serves_repeated_queries():
+    unreal.add_asset('/Game/Props/Chair')
+    cache = registry.get_registry()
+    # hits and misses are counted for the whole session
+    before = cache.stats()
+
+    for _ in range(3):
+        assets = cache.get_assets_by_path('/Game/Props/')
+    assert [str(a.package_name) for a in assets] == ['/Game/Props/Chair']
+    assert unreal.CALLS['AssetRegistry.get_assets_by_path'] == 1
+    after = cache.stats()
+    assert after['entries'] == 1
+    assert after['hits'] - before['hits'] == 2
+    assert after['misses'] - before['misses'] == 1
+
+
+def test_reads_are_uncached_by_default():
+    unreal.add_asset('/Game/Props/Chair')
+    assert len(editor.get_assets_from_folder('/Game/Props')) == 1
+    assert len(editor.get_assets_from_folder('/Game/Props', cached=True)) == 1
+
+    unreal.add_asset('/Game/Props/Table')
+    assert len(editor.get_assets_from_folder('/Game/Props')) == 2
+    # changed outside of the library, stale until cleared
+    assert len(editor.get_assets_from_folder('/Game/Props', cached=True)) == 1
+    registry.clear_cache()
+    assert len(editor.get_assets_from_folder('/Game/Props', cached=True)) == 2
+
+
+def test_invalidate_package():
+    unreal.add_asset('/Game/Props/Chair', dependencies=['/Game/Tex/Wood'])
+    unreal.add_asset('/Game/Tex/Wood')
+    unreal.add_asset('/Game/Sets/Room')
+    cache = registry.get_registry()
+    options = unreal.AssetRegistryDependencyOptions()
+    cache.get_assets_by_path('/Game', recursive=True)
+    cache.get_assets_by_path('/Game/Sets')
+    cache.get_dependencies('/Game/Props/Chair', options)
+    cache.get_referencers('/Game/Tex/Wood', options)
+
+    registry.clear_cache('/Game/Props/Chair.Chair')
+    assert set(key[:2] for key in cache.entries) == {('path', '/Game/Sets')}
+
+
+def test_library_writes_invalidate(new_sequence):
+    cache = registry.get_registry()
+    assert cache.get_assets_by_path('/Game/Cinematics') == []
+
+    sequence.create_seq('/Game/Cinematics/', 'sh010')
+    assert [str(a.package_name) for a in
+            cache.get_assets_by_path('/Game/Cinematics')] == [
+        '/Game/Cinematics/sh010']
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sys
+
+import pytest
+import unreal
+
+from cinematic import preset
+from render import render, renderCmd
+from render.telemetry import Telemetry
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                    'stub_editor.py')
+
+
+@pytest.fixture
+def base_preset():
+    return preset.MyPreset.get_base_preset()
+
+
+def test_handles_resolve_from_executor_delegates(base_preset):
+    renderer = render.Renderer()
+    handles = renderer.add_jobs([
+        ('sh010', '/Game/Maps/Main', '/Game/Cinematics/sh010', base_preset),
+        ('sh020', '/Game/Maps/Main', '/Game/Cinematics/sh020', base_preset),
+    ])
+    assert [h.status for h in handles] == [render.PENDING] * 2
+
+    assert renderer.render() == handles
+    assert all(h.status == render.SUCCEEDED for h in handles)
+    assert all(h.future.result(timeout=0) is h for h in handles)
+    assert handles[0].shot_times
+
+
+def test_failed_job_and_follow_up(base_preset):
+    unreal.FAIL_JOBS.add('bad')
+    telemetry = Telemetry()
+    renderer = render.Renderer(telemetry=telemetry)
+    good = renderer.add_job('good', '/Game/M', '/Game/S', base_preset)
+    bad = renderer.add_job('bad', '/Game/M', '/Game/S', base_preset)
+    names = good.then(lambda handle: handle.name)
+
+    renderer.render()
+    assert good.status == render.SUCCEEDED
+    assert bad.status == render.FAILED
+    assert bad.error == 'Fake failure'
+    assert names.result(timeout=0) == 'good'
+    assert [r.success for r in telemetry.records] == [True, False]
+
+
+def test_render_async(base_preset):
+    renderer = render.Renderer()
+    renderer.add_job('sh010', '/Game/M', '/Game/S', base_preset)
+    handles = asyncio.run(renderer.render_async())
+    assert [h.status for h in handles] == [render.SUCCEEDED]
+
+
+def test_job_index(base_preset):
+    renderer = render.Renderer()
+    renderer.add_job('sh010', '/Game/M', '/Game/S', base_preset)
+    with pytest.raises(ValueError):
+        renderer.add_job('sh010', '/Game/M', '/Game/S', base_preset)
+    with pytest.raises(ValueError):
+        renderer.add_jobs([('sh020', '/Game/M', '/Game/S', base_preset)] * 2)
+    assert len(renderer.jobs) == 1
+
+    assert renderer.remove_jobs(['sh010', 'missing']) == ['sh010']
+    assert renderer.get_job('sh010') is None
+    assert not renderer.jobs
+
+
+def test_commandline_setup_error_fails_handle(base_preset):
+    renderer = render.Renderer(mode=render.COMMANDLINE)
+    handle = renderer.add_job('sh010', '/Game/M', '/Game/S', base_preset)
+    renderer.render()
+    assert handle.future.result(timeout=5).status == render.FAILED
+    assert 'UNREAL_EXE' in handle.error
+
+
+def test_executor_exception_fails_handles(base_preset, monkeypatch):
+    renderer = render.Renderer()
+    handle = renderer.add_job('sh010', '/Game/M', '/Game/S', base_preset)
+
+    def broken(executor):
+        raise RuntimeError('no world')
+
+    monkeypatch.setattr(
+        renderer.subsystem, 'render_queue_with_executor_instance', broken)
+    with pytest.raises(RuntimeError):
+        renderer.render()
+    assert handle.status == render.FAILED
+
+
+def test_spec_arguments():
+    flags = renderCmd.build_args(renderCmd.RenderSpec(extra_flags=['-a']))
+    assert flags[-1] == '-a'
+    with pytest.raises(ValueError):
+        renderCmd.build_args(renderCmd.RenderSpec(quality=50))
+
+    legacy = renderCmd.build_args(
+        renderCmd.LEGACY_SPEC._replace(quality=50), legacy=True)
+    assert '-MovieQuality=50' in legacy
+
+
+def test_render_twice_gives_new_handles(base_preset):
+    telemetry = Telemetry()
+    renderer = render.Renderer(telemetry=telemetry)
+    first = renderer.add_job('sh010', '/Game/M', '/Game/S', base_preset)
+    assert renderer.render() == [first]
+
+    second, = renderer.render()
+    assert second is not first
+    assert renderer.get_job('sh010') is not None
+    assert first.status == second.status == render.SUCCEEDED
+    assert first.future.result(timeout=0) is first
+    assert second.future.result(timeout=0) is second
+    assert len(telemetry.records) == 2
+
+
+def test_commandline_records_job_names_and_queue_wait(base_preset,
+                                                      monkeypatch):
+    # the interpreter is the "editor" and the stub its project argument
+    monkeypatch.setattr(renderCmd, 'UNREAL_EXE', sys.executable)
+    monkeypatch.setattr(renderCmd, 'U_PROJECT', STUB)
+    monkeypatch.setenv('STUB_RENDER_SECONDS', '0.2')
+    telemetry = Telemetry()
+    renderer = render.Renderer(telemetry=telemetry, mode=render.COMMANDLINE)
+    names = ['sh010', 'sh020', 'sh030']
+    for name in names:
+        renderer.add_job(name, '/Game/M', '/Game/S', base_preset)
+
+    handles = renderer.render()
+    for handle in handles:
+        assert handle.future.result(timeout=10).status == render.SUCCEEDED
+
+    records = {record.name: record for record in telemetry.records}
+    assert sorted(records) == names
+    # one worker, each job waits for the previous ones
+    assert records['sh030'].queue_wait > records['sh010'].queue_wait + 0.3
+
+
+def test_new_process_resolves_from_executor_finished(base_preset):
+    unreal.FAIL_JOBS.add('bad')
+    renderer = render.Renderer(mode=render.NEW_PROCESS)
+    good = renderer.add_job('good', '/Game/M', '/Game/S', base_preset)
+    bad = renderer.add_job('bad', '/Game/M', '/Game/S', base_preset)
+
+    renderer.render()
+    assert good.done and bad.done
+    assert bad.status == render.FAILED
+    assert bad.error == 'Fake failure'
@@ -0,0 +1,60 @@
+import os
+import time
+
+import unreal
+
+from cinematic import section, sequence
+
+
+def add_shot(u_master, u_sub_seq, start, end):
+    u_track = (u_master.find_master_tracks_by_type(
+        unreal.MovieSceneCinematicShotTrack) or [
+        sequence.add_track(u_master, unreal.MovieSceneCinematicShotTrack)])[0]
+    u_section = u_track.add_section()
+    section.set_sub_seq(u_section, u_sub_seq)
+    section.set_range(u_section, start, end)
+    return u_section
+
+
+def save(*u_assets):
+    # later mtime than any earlier save, whatever the file system resolution
+    mtime = time.time() + len(sequence.SHOT_CACHE) + 1
+    for u_asset in u_assets:
+        unreal.EditorAssetLibrary.save_loaded_asset(u_asset, False)
+        package = u_asset.get_path_name().split('.')[0]
+        os.utime(unreal._sys_path(package), (mtime, mtime))
+
+
+def test_package_paths_hit_the_cache(new_sequence):
+    u_master = new_sequence('master_a')
+    add_shot(u_master, new_sequence('sh010_a'), 0, 50)
+    save(u_master)
+
+    package = u_master.get_path_name().split('.')[0]
+    first = sequence.get_shots_bulk([package])[package]
+    unreal.CALLS.clear()
+    assert sequence.get_shots_bulk([package])[package] is first
+    assert not unreal.CALLS['load_asset']
+
+
+def test_nested_shot_change_invalidates(new_sequence):
+    u_master = new_sequence('master_b')
+    u_shot = new_sequence('sh010_b')
+    u_leaf = new_sequence('sh010_b_a')
+    add_shot(u_master, u_shot, 0, 50)
+    add_shot(u_shot, u_leaf, 0, 20)
+    save(u_master, u_shot, u_leaf)
+
+    master = u_master.get_path_name()
+    shots = sequence.get_shots_bulk([master], recursive=True)[master]
+    assert [(s.name, s.depth) for s in shots] == [
+        ('sh010_b', 0), ('sh010_b_a', 1)]
+    assert sequence.get_shots_bulk(
+        [master], recursive=True)[master] is shots
+
+    # only the nested shot sequence changes and gets saved
+    u_leaf = new_sequence('sh010_b_b')
+    add_shot(u_shot, u_leaf, 20, 50)
+    save(u_shot, u_leaf)
+    shots = sequence.get_shots_bulk([master], recursive=True)[master]
+    assert [s.name for s in shots] == ['sh010_b', 'sh010_b_a', 'sh010_b_b']